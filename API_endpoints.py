@@ -1,9 +1,20 @@
-from fastapi import Depends, HTTPException, FastAPI, Response, status
+from fastapi import Body, Depends, HTTPException, FastAPI, Path, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
+import os
+import numpy as np
 import pandas as pd
-from typing import Annotated, List
+from itertools import islice
+from typing import Annotated, Dict, Iterator, List, Optional, Tuple, Union
 
 # internal imports
-from helper_functions import get_data
+from ride_store import CombinedRideStore, LazyRideStore, SUMMARY_FIELDS, MIN_RESOLUTION, bin_points, load_directory_stores, load_directory_summaries
+from track_simplify import zoom_tolerance
+from gps_encoding import ENCODINGS, DEFAULT_PRECISION, encode_gps
+from dataset import Dataset
+from snapshot_cache import SourceChangedError
+from serialization import JSON_MEDIA_TYPE, NDJSON_MEDIA_TYPE, binary_media_type, columnar_response, json_response, ndjson_lines
+from response_cache import ResponseCache
+from compression import Compression, CompressionMiddleware
 from models import *
 from fake_auth import auth_router, get_current_user
 
@@ -24,8 +35,53 @@ file_paths = [
   'data/database_csv_3',
 ]
 
-# extract the data from the csv files
-data = get_data(file_paths)
+# number of worker processes parsing the directories, 0 for one per CPU core
+ingest_workers = int(os.getenv('INGEST_WORKERS', '1'))
+# memory used by a worker to parse one chunk of sensor_data.csv or gps_data.csv
+ingest_memory_budget = int(os.getenv('INGEST_MEMORY_BUDGET_MB', '256')) * 2**20
+
+# 'eager' loads every ride at startup, 'lazy' only loads the ride summaries and reads the other data
+# of a ride when it is requested, keeping at most LAZY_CACHE_MB of rides in memory
+data_loading = os.getenv('DATA_LOADING', 'eager')
+lazy_cache_bytes = int(os.getenv('LAZY_CACHE_MB', '256')) * 2**20
+
+# extract the data of each directory from the csv files: a columnar store per directory, or the ride summaries in lazy mode
+def load_parts(dir_paths: list) -> list:
+  if data_loading == 'lazy':
+    return load_directory_summaries(dir_paths, workers=ingest_workers, memory_budget=ingest_memory_budget)
+  return load_directory_stores(dir_paths, workers=ingest_workers, memory_budget=ingest_memory_budget)
+
+# store of all the directories from their parts
+def combine_parts(dir_paths: list, parts: list):
+  if data_loading == 'lazy':
+    return LazyRideStore(dir_paths, parts, max_bytes=lazy_cache_bytes, memory_budget=ingest_memory_budget)
+  return CombinedRideStore(parts)
+
+# new directories matching DATA_DIR_PATTERN and changed csv files are loaded every REFRESH_INTERVAL seconds
+# (0 disables the refresh), the endpoints keep serving the previous version until the new one is loaded
+refresh_interval = float(os.getenv('REFRESH_INTERVAL', '0'))
+dataset = Dataset(load_parts, combine_parts, file_paths, dir_pattern=os.getenv('DATA_DIR_PATTERN', 'data/database_csv_*'))
+if refresh_interval > 0:
+  dataset.start(refresh_interval)
+
+# in lazy mode a ride is not read if the csv files of its directory changed since the current version was loaded,
+# the request can be retried once the refresh loaded the new version
+@data_router.exception_handler(SourceChangedError)
+def source_changed(request: Request, error: SourceChangedError) -> Response:
+  return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                      content={'detail': 'The data changed since it was loaded, retry once it is refreshed.'})
+
+# the responses of at least COMPRESSION_MIN_BYTES are compressed in the first encoding of RESPONSE_COMPRESSION
+# accepted by the client ('br' and 'zstd' need the brotli and zstandard packages, an empty list disables the compression)
+compression = Compression(
+  [encoding.strip() for encoding in os.getenv('RESPONSE_COMPRESSION', 'br,zstd,gzip').split(',') if encoding.strip()],
+  int(os.getenv('COMPRESSION_MIN_BYTES', '1024')),
+)
+data_router.add_middleware(CompressionMiddleware, compression=compression)
+
+# serialized responses of the current data version, at most RESPONSE_CACHE_MB of them (0 disables the cache),
+# the cache keeps their compressed bodies as well so each encoding of a response is computed once per data version
+response_cache = ResponseCache(int(os.getenv('RESPONSE_CACHE_MB', '64')) * 2**20, lambda: dataset.current.version, compression)
 
 # -----------------
 # Fake Authentication
@@ -33,73 +89,330 @@ data = get_data(file_paths)
 
 from fake_auth import *
   
+# -----------------
+# Pagination and Streaming
+# -----------------
+
+# The list endpoints return a page of limit records starting at the cursor when one of them is given,
+# the cursor of the next page is returned in the X-Next-Cursor header until the last page.
+# A cursor is the position of the next record in a version of the data, it is rejected once a refresh loaded
+# another version as the positions may have changed.
+# With the NDJSON_MEDIA_TYPE Accept header the records are streamed as one JSON document per line instead of a JSON list,
+# with an Arrow IPC or MessagePack Accept header the columns of the records are sent in this format (see serialization.py).
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+# number of records converted and sent at once
+STREAM_CHUNK_SIZE = 1000
+
+# range [start, end) of the records of the page and cursor of the next page (None for the last page)
+def page_range(version: str, total: int, cursor: Optional[str], limit: Optional[int]):
+  start = 0
+  if cursor is not None:
+    cursor_version, _, position = cursor.partition(':')
+    if not position.isdigit():
+      raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f'Invalid cursor {cursor}.')
+    if cursor_version != version:
+      raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail='The data changed since the cursor was returned, start again from the first page.'
+        )
+    start = min(int(position), total)
+  end = total if limit is None else min(start + limit, total)
+  return start, end, f'{version}:{end}' if end < total else None
+
+# return the records as a JSON list, their columns in a binary format or stream them as NDJSON depending on the Accept header
+def list_response(request: Request, records: Iterator[dict], columns: Dict[str, np.ndarray], next_cursor: Optional[str] = None) -> Response:
+  headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+  accept = request.headers.get('accept', '')
+  media_type = binary_media_type(accept)
+  if media_type is not None:
+    return columnar_response(columns, media_type, headers)
+  if NDJSON_MEDIA_TYPE in accept:
+    return StreamingResponse(ndjson_lines(records, STREAM_CHUNK_SIZE), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+  return json_response(list(records), headers)
+
+# -----------------
+# Response Cache
+# -----------------
+
+# The responses of the endpoints below only change with the data version, they are served from response_cache
+# with a strong ETag and a 304 answer to a matching If-None-Match header.
+# The representation of the response depends on the Accept header, it is part of the cache key.
+def cached_response(request: Request, version: str, build) -> Response:
+  accept = request.headers.get('accept', '')
+  variant = binary_media_type(accept) or (NDJSON_MEDIA_TYPE if NDJSON_MEDIA_TYPE in accept else JSON_MEDIA_TYPE)
+  return response_cache.respond(request, version, variant, build)
+
+# -----------------
+# GPS Encoding
+# -----------------
+
+# With the encoding parameter the GPS coordinates are returned in one of the compact encodings of gps_encoding.py,
+# rounded to 10**-precision degrees, instead of a list of float pairs
+GpsEncoding = Annotated[Optional[str], Query(pattern=f'^({"|".join(ENCODINGS)})$')]
+GpsPrecision = Annotated[int, Query(ge=0, le=7)]
+
 # -----------------
 # Overview Endpoints
 # -----------------
 
+# The data endpoints build plain dicts and lists from the arrays of the store and return them serialized
+# by serialization.json_response, skipping the validation of every item by the response_model.
+
 # return the rides name in the database
-@data_router.get('/dashboard/rides')
+@data_router.get('/dashboard/rides', response_model=List[compressed_ride])
 def list_ride(
+  request: Request,
   current_user: Annotated[User, Depends(get_current_user)],
-) -> List[compressed_ride]:
-  list = []
-  for ride in data:
-    list.append(ride.copy())
-    del(list[-1]['scenes'])
-  return list
+  cursor: Optional[str] = None,
+  limit: Annotated[Optional[int], Query(ge=1)] = None,
+) -> Response:
+  current = dataset.current
+  def build():
+    summaries = current.store.ride_summaries()
+    start, end, next_cursor = page_range(current.version, len(summaries), cursor, limit)
+    columns = {field: current.store.rides[field][start:end] for field in SUMMARY_FIELDS}
+    return list_response(request, islice(summaries, start, end), columns, next_cursor)
+  return cached_response(request, current.version, build)
+
+# return the totals and averages of the rides and their number per day and per week,
+# computed when the data is loaded (declared before /dashboard/{ride_name} which would match it)
+@data_router.get('/dashboard/summary', response_model=overview_summary)
+def get_summary(
+  request: Request,
+  current_user: Annotated[User, Depends(get_current_user)],
+) -> Response:
+  current = dataset.current
+  return cached_response(request, current.version, lambda: json_response(current.store.aggregates))
+
+# GPS records [start, end) of the columns, converted STREAM_CHUNK_SIZE at a time
+def gps_records(lat: np.ndarray, lon: np.ndarray, density: np.ndarray, start: int, end: int) -> Iterator[dict]:
+  for chunk_start in range(start, end, STREAM_CHUNK_SIZE):
+    chunk = slice(chunk_start, min(chunk_start + STREAM_CHUNK_SIZE, end))
+    for latitude, longitude, value in zip(lat[chunk].tolist(), lon[chunk].tolist(), density[chunk].tolist()):
+      yield {'Latitude': latitude,
+             'Longitude': longitude,
+             'Density': value,
+             }
 
 # return the GPS points of all the rides
-@data_router.get('/dashboard/gps')
+@data_router.get('/dashboard/gps', response_model=Union[List[aggregated_gps], encoded_gps_data])
 def get_gps_data(
+  request: Request,
   current_user: Annotated[User, Depends(get_current_user)],
-) -> List[aggregated_gps]:
-  points = []
-  for ride in data:
-    for scene in ride['scenes']:
-      for sample in scene['samples']:
-        for sensor in sample['sensors']:
-          if sensor['lat']!=None and sensor['lon']!=None and sensor['hgt']!=None and (sensor['lat']!=0 or sensor['lon']!=0 or sensor['hgt']!=0):
-            
-            points.append({'Latitude': sensor['lat'],
-                           'Longitude': sensor['lon'],
-                           'Density': sensor['hgt'], # use height as density
-                           })
-  return points
+  cursor: Optional[str] = None,
+  limit: Annotated[Optional[int], Query(ge=1)] = None,
+  encoding: GpsEncoding = None,
+  precision: GpsPrecision = DEFAULT_PRECISION,
+) -> Response:
+  current = dataset.current
+  def build():
+    # use height as density
+    lat, lon, hgt = current.store.gps_points()
+    start, end, next_cursor = page_range(current.version, len(lat), cursor, limit)
+    if encoding is not None:
+      return json_response({'gps_coordinates': encode_gps(lat[start:end], lon[start:end], encoding, precision),
+                            'Density': hgt[start:end].tolist(),
+                            }, {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None)
+    columns = {'Latitude': lat[start:end], 'Longitude': lon[start:end], 'Density': hgt[start:end]}
+    return list_response(request, gps_records(lat, lon, hgt, start, end), columns, next_cursor)
+  return cached_response(request, current.version, build)
+
+# return the number of GPS points of all the rides in each cell of a grid of resolution degrees,
+# optionally restricted to a bounding box (resolution of at least MIN_RESOLUTION)
+@data_router.get('/dashboard/gps/heatmap', response_model=List[aggregated_gps])
+def get_gps_heatmap(
+  request: Request,
+  current_user: Annotated[User, Depends(get_current_user)],
+  resolution: Annotated[float, Query(ge=MIN_RESOLUTION)] = 0.001,
+  min_lat: Optional[float] = None,
+  min_lon: Optional[float] = None,
+  max_lat: Optional[float] = None,
+  max_lon: Optional[float] = None,
+) -> Response:
+  current = dataset.current
+  def build():
+    lat, lon, _ = current.store.gps_points()
+    cell_lat, cell_lon, counts = bin_points(lat, lon, resolution, min_lat, min_lon, max_lat, max_lon)
+    # number of points in the cell
+    density = counts.astype(np.float64)
+    return list_response(request, gps_records(cell_lat, cell_lon, density, 0, len(density)),
+                         {'Latitude': cell_lat, 'Longitude': cell_lon, 'Density': density})
+  return cached_response(request, current.version, build)
+
+# rides and GPS points of all the rides in an area, found with the spatial index of the store.
+# In a binary format only the columns of the points are sent, the rides are the distinct values of their ride column.
+def gps_area_response(request: Request, store, bbox=None, circle=None) -> Response:
+  rides, sample_tokens, lat, lon = store.gps_in_area(bbox=bbox, circle=circle)
+  names = store.rides['name']
+  media_type = binary_media_type(request.headers.get('accept', ''))
+  if media_type is not None:
+    return columnar_response({'ride': names[rides], 'sample_token': sample_tokens, 'Latitude': lat, 'Longitude': lon}, media_type)
+  return json_response({'rides': names[np.unique(rides)].tolist(),
+                        'points': [{'ride': name,
+                                    'sample_token': sample_token,
+                                    'Latitude': latitude,
+                                    'Longitude': longitude,
+                                    } for name, sample_token, latitude, longitude in zip(names[rides].tolist(), sample_tokens.tolist(), lat.tolist(), lon.tolist())],
+                        })
+
+# return the rides and the GPS points inside a bounding box
+@data_router.get('/dashboard/gps/bbox', response_model=gps_area)
+def get_gps_in_bbox(
+  request: Request,
+  current_user: Annotated[User, Depends(get_current_user)],
+  min_lat: Annotated[float, Query(ge=-90, le=90)],
+  min_lon: Annotated[float, Query(ge=-180, le=180)],
+  max_lat: Annotated[float, Query(ge=-90, le=90)],
+  max_lon: Annotated[float, Query(ge=-180, le=180)],
+) -> Response:
+  return gps_area_response(request, dataset.current.store, bbox=(min_lat, min_lon, max_lat, max_lon))
+
+# return the rides and the GPS points at most radius km away from a coordinate
+@data_router.get('/dashboard/gps/radius', response_model=gps_area)
+def get_gps_in_radius(
+  request: Request,
+  current_user: Annotated[User, Depends(get_current_user)],
+  lat: Annotated[float, Query(ge=-90, le=90)],
+  lon: Annotated[float, Query(ge=-180, le=180)],
+  radius: Annotated[float, Query(gt=0)],
+) -> Response:
+  return gps_area_response(request, dataset.current.store, circle=(lat, lon, radius))
+
+# -----------------
+# Admin Endpoints
+# -----------------
+
+# return the version of the loaded data and when the directories were last checked for changes
+@data_router.get('/admin/data-version')
+def get_data_version(
+  current_user: Annotated[User, Depends(get_current_user)],
+) -> data_version:
+  current = dataset.current
+  return {'version': current.version,
+          'loaded_at': current.loaded_at.isoformat(),
+          'last_refresh': dataset.last_refresh.isoformat() if dataset.last_refresh else None,
+          'last_error': dataset.last_error,
+          'num_directories': len(current.dir_paths),
+          'num_rides': len(current.store),
+          }
 
 # -----------------
 # Data Endpoints
 # -----------------
 
-# return the merged data of the given ride
-@data_router.get('/dashboard/{ride_name}')
+# latitude and longitude of a GPS track without the points of rank below the tolerance (in m): the given tolerance,
+# or one pixel at the zoom level of the map at the latitude of the first point. The whole track if neither is given.
+def simplify_track(lat: np.ndarray, lon: np.ndarray, rank: np.ndarray, zoom: Optional[float],
+                   tolerance: Optional[float]) -> Tuple[np.ndarray, np.ndarray]:
+  if tolerance is None and zoom is not None and len(lat):
+    tolerance = zoom_tolerance(zoom, float(lat[0]))
+  if tolerance is None:
+    return lat, lon
+  keep = rank >= tolerance
+  return lat[keep], lon[keep]
+
+# gps_coordinates of a track, encoded or as a list of [latitude, longitude] pairs
+def track_coordinates(lat: np.ndarray, lon: np.ndarray, encoding: Optional[str], precision: int):
+  if encoding is not None:
+    return encode_gps(lat, lon, encoding, precision)
+  return np.column_stack((lat, lon)).tolist()
+
+# index of the ride with the given name, 404 if it is not loaded
+def find_ride_or_404(store, ride_name: str) -> int:
+  ride = store.find_ride(ride_name)
+  if ride is None:
+    raise HTTPException(
+          status_code=status.HTTP_404_NOT_FOUND, detail=f'Ride {ride_name} not found.'
+      )
+  return ride
+
+# merged data of a ride: the fields of ride_data from its summary and its GPS track
+def ride_result(store, ride: int, zoom: Optional[float], tolerance: Optional[float], encoding: Optional[str], precision: int) -> dict:
+  # copy the fields of ride_data from the shared summary before adding the GPS data
+  summary = store.ride_summaries([ride])[0]
+  result = {field: summary[field] for field in ride_data.model_fields if field in summary}
+  # create the gps_coordinates from the sensors measurment
+  lat, lon = simplify_track(*store.gps_track(ride), zoom, tolerance)
+  result['gps_coordinates'] = track_coordinates(lat, lon, encoding, precision)
+  return result
+
+# return the merged data of the given ride.
+# The GPS track is simplified for a tolerance in m (points closer than that to the simplified track are dropped)
+# or for the zoom level of the map showing it (a tolerance of one pixel), the whole track is returned by default.
+@data_router.get('/dashboard/{ride_name}', response_model=Union[ride_data, encoded_ride_data])
 def get_ride_data(
+  request: Request,
   ride_name: str,
   current_user: Annotated[User, Depends(get_current_user)],
-) -> ride_data:
-  for ride in data:
-    if ride['name'] == ride_name:
-      result = {'name': ride['name'],
-                'duration': ride['duration'],
-                'date': ride['date'],
-                'time': ride['time'],
-                'distance': ride['distance'],
-                }
-      result['num_scenes'] = len(ride['scenes'])
-      result['num_samples'] = sum([len(scene['samples']) for scene in ride['scenes']])
-      # create the gps_coordinates from the sensors measurment
-      gps = []
-      for scene in ride['scenes']:
-        for sample in scene['samples']:
-          for sensor in sample['sensors']:
-            if sensor['lat']!=None and sensor['lon']!=None and sensor['hgt']!=None and (sensor['lat']!=0 or sensor['lon']!=0 or sensor['hgt']!=0):
-              gps.append([sensor['lat'],sensor['lon']])
-      result['gps_coordinates'] = gps
-      result['gps_heatmap_data'] = gps
-      return result
-    
-  raise HTTPException(
-        status_code=status.HTTP_404_NOT_FOUND, detail=f'Ride {ride_name} not found.'
-    )
-  
+  zoom: Annotated[Optional[float], Query(ge=0, le=24)] = None,
+  tolerance: Annotated[Optional[float], Query(ge=0)] = None,
+  encoding: GpsEncoding = None,
+  precision: GpsPrecision = DEFAULT_PRECISION,
+) -> Response:
+  current = dataset.current
+  def build():
+    store = current.store
+    return json_response(ride_result(store, find_ride_or_404(store, ride_name), zoom, tolerance, encoding, precision))
+  return cached_response(request, current.version, build)
+
+# maximum number of rides requested at once from get_rides_data
+MAX_BATCH_RIDES = 100
 
+# return the merged data of several rides in one response, in the order of ride_names, 404 if one of them is not loaded.
+# The parameters are the ones of get_ride_data, applied to every ride.
+@data_router.post('/dashboard/rides/details', response_model=List[Union[ride_data, encoded_ride_data]])
+def get_rides_data(
+  ride_names: Annotated[List[str], Body(max_length=MAX_BATCH_RIDES)],
+  current_user: Annotated[User, Depends(get_current_user)],
+  zoom: Annotated[Optional[float], Query(ge=0, le=24)] = None,
+  tolerance: Annotated[Optional[float], Query(ge=0)] = None,
+  encoding: GpsEncoding = None,
+  precision: GpsPrecision = DEFAULT_PRECISION,
+) -> Response:
+  store = dataset.current.store
+  rides = [store.find_ride(ride_name) for ride_name in ride_names]
+  missing = [ride_name for ride_name, ride in zip(ride_names, rides) if ride is None]
+  if missing:
+    raise HTTPException(
+          status_code=status.HTTP_404_NOT_FOUND, detail=f'Rides {", ".join(missing)} not found.'
+      )
+  return json_response([ride_result(store, ride, zoom, tolerance, encoding, precision) for ride in rides])
+
+# return the scenes of the given ride with their number of samples and GPS points and their time span
+@data_router.get('/dashboard/{ride_name}/scenes', response_model=List[scene_summary])
+def list_scenes(
+  request: Request,
+  ride_name: str,
+  current_user: Annotated[User, Depends(get_current_user)],
+) -> Response:
+  current = dataset.current
+  def build():
+    store = current.store
+    return json_response(store.scene_summaries(find_ride_or_404(store, ride_name)))
+  return cached_response(request, current.version, build)
 
+# return a scene of the given ride, scene is its position in the ride starting from 0.
+# The GPS track of the scene is its slice of the ride track, simplified and encoded as in get_ride_data.
+@data_router.get('/dashboard/{ride_name}/scenes/{scene}', response_model=Union[scene_data, encoded_scene_data])
+def get_scene_data(
+  request: Request,
+  ride_name: str,
+  scene: Annotated[int, Path(ge=0)],
+  current_user: Annotated[User, Depends(get_current_user)],
+  zoom: Annotated[Optional[float], Query(ge=0, le=24)] = None,
+  tolerance: Annotated[Optional[float], Query(ge=0)] = None,
+  encoding: GpsEncoding = None,
+  precision: GpsPrecision = DEFAULT_PRECISION,
+) -> Response:
+  current = dataset.current
+  def build():
+    store = current.store
+    ride = find_ride_or_404(store, ride_name)
+    if store.find_scene(ride, scene) is None:
+      raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f'Scene {scene} of ride {ride_name} not found.'
+        )
+    result = {'ride': ride_name, **store.scene_summaries(ride)[scene]}
+    lat, lon = simplify_track(*store.scene_track(ride, scene), zoom, tolerance)
+    result['gps_coordinates'] = track_coordinates(lat, lon, encoding, precision)
+    return json_response(result)
+  return cached_response(request, current.version, build)
@@ -0,0 +1,120 @@
+import argparse
+import timeit
+import pandas as pd
+from datetime import datetime
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from math import radians, cos, sin, asin, sqrt, isnan
+from typing import List
+
+from helper_functions import assemble_rides, load_directories, link_directory, rank_gps, summarize_rides
+from models import aggregated_gps
+from ride_store import RideStore
+from serialization import json_response, orjson
+
+# Benchmarks on the bundled data directories, run with: python benchmark.py [benchmark ...]
+
+DIR_PATHS = ['database_csv_1', 'database_csv_3']
+
+
+# -----------------
+# Ride distance and duration
+# -----------------
+
+# previous implementation, per sample sort with strptime in the key and a scalar haversine loop
+def previous_haversine(lat1, lon1, lat2, lon2):
+    dlat = radians(lat2) - radians(lat1)
+    dlon = radians(lon2) - radians(lon1)
+    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
+    return 2 * asin(sqrt(a)) * 6371
+
+
+def previous_summaries(rides_data):
+    for ride in rides_data:
+        times = sorted(datetime.strptime(sample['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
+                       for scene in ride['scenes'] for sample in scene['samples'])
+        ride['duration'] = (times[-1] - times[0]).total_seconds()
+        distance = 0.0
+        for scene in ride['scenes']:
+            for sample in scene['samples']:
+                coords = sorted(
+                    [sensor for sensor in sample['sensors'] if sensor['lat'] is not None and not isnan(sensor['lat'])],
+                    key=lambda x: datetime.strptime(x['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
+                )
+                for i in range(1, len(coords)):
+                    distance += previous_haversine(coords[i]['lat'], coords[i]['lon'], coords[i-1]['lat'], coords[i-1]['lon'])
+        ride['distance'] = distance
+
+
+# Repeat the samples and sensors of a linked directory scale times (with new tokens) to benchmark larger rides
+def scale_directory(linked, scale: int):
+    dir_rides, dir_scenes_list, dir_sample_list, dir_sensor_list = linked[:4]
+    sample_step = int(dir_sample_list['token'].max()) + 1
+    sensor_step = int(dir_sensor_list['token'].max()) + 1
+    samples = pd.concat([dir_sample_list.assign(token=dir_sample_list['token'] + k * sample_step) for k in range(scale)], ignore_index=True)
+    sensors = pd.concat([dir_sensor_list.assign(token=dir_sensor_list['token'] + k * sensor_step,
+                                                sample_token=dir_sensor_list['sample_token'] + k * sample_step)
+                         for k in range(scale)], ignore_index=True)
+    return rank_gps(link_directory((dir_rides, dir_scenes_list, samples, sensors)))
+
+
+def bench_summaries(number: int, scale: int) -> None:
+    linked = [scale_directory(directory, scale) for directory in load_directories(DIR_PATHS)]
+    rides_data = assemble_rides(linked)
+    num_sensors = sum(len(directory[3]) for directory in linked)
+    previous = timeit.timeit(lambda: previous_summaries(rides_data), number=number) / number
+    # linking the frames is also needed to build the store, so it is timed separately
+    linking = timeit.timeit(lambda: [link_directory(directory[:4]) for directory in linked], number=number) / number
+    vectorized = timeit.timeit(lambda: [summarize_rides(*link) for link in linked], number=number) / number
+    print(f'ride summaries ({num_sensors} sensors): previous {previous * 1e3:.2f} ms, '
+          f'vectorized {vectorized * 1e3:.2f} ms (+ {linking * 1e3:.2f} ms linking)')
+
+
+# -----------------
+# GPS endpoint serialization
+# -----------------
+
+def bench_serialization(number: int, scale: int) -> None:
+    store = RideStore.from_frames([scale_directory(directory, scale) for directory in load_directories(DIR_PATHS)])
+    lat, lon, hgt = store.gps_points()
+
+    def records():
+        return [{'Latitude': latitude, 'Longitude': longitude, 'Density': height}
+                for latitude, longitude, height in zip(lat.tolist(), lon.tolist(), hgt.tolist())]
+
+    app = FastAPI()
+
+    # previous implementation, every item validated and serialized by the response model
+    @app.get('/previous')
+    def previous() -> List[aggregated_gps]:
+        return records()
+
+    @app.get('/fast', response_model=List[aggregated_gps])
+    def fast() -> Response:
+        return json_response(records())
+
+    client = TestClient(app)
+    assert client.get('/previous').json() == client.get('/fast').json()
+    encoder = 'orjson' if orjson is not None else 'json'
+    for name in ['previous', 'fast']:
+        seconds = timeit.timeit(lambda: client.get(f'/{name}'), number=number) / number
+        print(f'GET /dashboard/gps {name} ({len(lat)} points{", " + encoder if name == "fast" else ""}): '
+              f'{seconds * 1e3:.2f} ms, {len(lat) / seconds:,.0f} points/s')
+
+
+BENCHMARKS = {
+    'summaries': bench_summaries,
+    'serialization': bench_serialization,
+}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('benchmarks', nargs='*', help=f'benchmarks to run among {list(BENCHMARKS)}, all of them by default')
+    parser.add_argument('--number', type=int, default=20, help='number of runs averaged')
+    parser.add_argument('--scale', type=int, default=1, help='number of times the bundled samples and sensors are repeated')
+    args = parser.parse_args()
+    for name in args.benchmarks or BENCHMARKS:
+        if name not in BENCHMARKS:
+            parser.error(f'unknown benchmark {name}')
+        BENCHMARKS[name](args.number, args.scale)
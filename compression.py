@@ -0,0 +1,183 @@
+import gzip
+import zlib
+from typing import Dict, List, Optional
+
+# brotli and zstandard are optional, their encodings are only offered when they are installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# compression level of each encoding, chosen for the large JSON responses: the higher levels shrink them
+# a few percent more for several times the CPU time
+LEVELS = {'br': 5, 'zstd': 3, 'gzip': 6}
+
+
+# Encodings the installed libraries can produce, in the order of preference of the server
+def available_encodings() -> List[str]:
+    encodings = []
+    if brotli is not None:
+        encodings.append('br')
+    if zstandard is not None:
+        encodings.append('zstd')
+    encodings.append('gzip')
+    return encodings
+
+
+# Accepted encodings of an Accept-Encoding header and their quality, e.g. 'gzip, br;q=0.5' -> {'gzip': 1.0, 'br': 0.5}
+def accepted_encodings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    accepted = {}
+    for item in (accept_encoding or '').split(','):
+        name, _, params = item.partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+# Incremental compressor of a streamed body: compress() returns the compressed data of a chunk, flushed
+# so that the client can decode every chunk as it arrives, finish() returns the end of the stream
+class StreamCompressor:
+    def __init__(self, encoding: str):
+        level = LEVELS[encoding]
+        self.encoding = encoding
+        if encoding == 'br':
+            self.compressor = brotli.Compressor(quality=level)
+        elif encoding == 'zstd':
+            self.compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            self.compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self.compressor.process(data) + self.compressor.flush()
+        if self.encoding == 'zstd':
+            return self.compressor.compress(data) + self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+
+# Compression of the responses in the encodings (the first one accepted by the client is used) when their body
+# has at least minimum_size bytes, the smaller bodies are sent as they are
+class Compression:
+    def __init__(self, encodings: List[str], minimum_size: int):
+        self.encodings = [encoding for encoding in encodings if encoding in available_encodings()]
+        self.minimum_size = minimum_size
+
+    # Encoding of the response to a request with this Accept-Encoding header, None to send it uncompressed
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        accepted = accepted_encodings(accept_encoding)
+        for encoding in self.encodings:
+            if accepted.get(encoding, accepted.get('*', 0.0)) > 0:
+                return encoding
+        return None
+
+    def compressible(self, body: bytes) -> bool:
+        return len(body) >= self.minimum_size
+
+    @staticmethod
+    def compress(body: bytes, encoding: str) -> bytes:
+        level = LEVELS[encoding]
+        if encoding == 'br':
+            return brotli.compress(body, quality=level)
+        if encoding == 'zstd':
+            return zstandard.ZstdCompressor(level=level).compress(body)
+        # mtime 0 gives the same bytes for the same body
+        return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+# Add a value to a comma separated header value if it is not already in it
+def vary_with(vary: Optional[str], name: str) -> str:
+    values = [value.strip() for value in (vary or '').split(',') if value.strip()]
+    if name.lower() not in [value.lower() for value in values]:
+        values.append(name)
+    return ', '.join(values)
+
+
+# ASGI middleware compressing the responses negotiated by compression.
+# A response already having a Content-Encoding (e.g. a cached one, see response_cache.py) is sent as it is,
+# a streamed response is compressed chunk by chunk.
+class CompressionMiddleware:
+    def __init__(self, app, compression: Compression):
+        self.app = app
+        self.compression = compression
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        headers = dict((name.decode('latin-1').lower(), value.decode('latin-1')) for name, value in scope['headers'])
+        encoding = self.compression.negotiate(headers.get('accept-encoding'))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, CompressingSend(send, self.compression, encoding))
+
+
+# send() of a response compressing its body
+class CompressingSend:
+    def __init__(self, send, compression: Compression, encoding: str):
+        self.send = send
+        self.compression = compression
+        self.encoding = encoding
+        self.start = None
+        self.stream: Optional[StreamCompressor] = None
+        # None until the first body message decides whether the body is compressed
+        self.compressing: Optional[bool] = None
+
+    def start_headers(self, remove=(), add=()) -> list:
+        headers = [(name, value) for name, value in self.start['headers'] if name.lower() not in remove]
+        vary = None
+        for name, value in headers:
+            if name.lower() == b'vary':
+                vary = value.decode('latin-1')
+        headers = [(name, value) for name, value in headers if name.lower() != b'vary']
+        headers.append((b'vary', vary_with(vary, 'Accept-Encoding').encode('latin-1')))
+        return headers + list(add)
+
+    async def __call__(self, message):
+        if message['type'] == 'http.response.start':
+            self.start = message
+            return
+        if message['type'] != 'http.response.body' or self.compressing is False:
+            await self.send(message)
+            return
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if self.compressing is None:
+            encoded = any(name.lower() == b'content-encoding' for name, _ in self.start['headers'])
+            self.compressing = not encoded and (more_body or self.compression.compressible(body))
+            if not self.compressing:
+                await self.send(self.start)
+                await self.send(message)
+                return
+            content_encoding = [(b'content-encoding', self.encoding.encode('latin-1'))]
+            if not more_body:
+                body = self.compression.compress(body, self.encoding)
+                headers = self.start_headers((b'content-length',), content_encoding + [(b'content-length', str(len(body)).encode('latin-1'))])
+                await self.send({**self.start, 'headers': headers})
+                await self.send({'type': 'http.response.body', 'body': body})
+                return
+            self.stream = StreamCompressor(self.encoding)
+            await self.send({**self.start, 'headers': self.start_headers((b'content-length',), content_encoding)})
+        data = self.stream.compress(body) if body else b''
+        if not more_body:
+            data += self.stream.finish()
+        await self.send({'type': 'http.response.body', 'body': data, 'more_body': more_body})
@@ -3,11 +3,18 @@ import pandas as pd
 import plotly.express as px
 import httpx
 import os
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import OrderedDict
 from typing import Union
 
-from generated_client.fast_api_client import AuthenticatedClient
+from generated_client.fast_api_client import AuthenticatedClient, dataframes
 from generated_client.fast_api_client.types import Response
-from generated_client.fast_api_client.api.default import list_ride_dashboard_rides_get, get_gps_data_dashboard_gps_get, get_ride_data_dashboard_ride_name_get
+from generated_client.fast_api_client.gps_encoding import decode_gps
+from generated_client.fast_api_client.etag_cache import ETagCache, ETagCacheTransport
+from generated_client.fast_api_client.api.default import list_ride_dashboard_rides_get, get_summary_dashboard_summary_get, get_gps_heatmap_dashboard_gps_heatmap_get, get_scene_data_dashboard_ride_name_scenes_scene_get, get_rides_data_dashboard_rides_details_post, get_data_version_admin_data_version_get
 
 
 # Get the API URL and authentication URL from environment variables
@@ -63,231 +70,443 @@ if not st.session_state.authenticated:
             st.stop()
     
 
-client = AuthenticatedClient(
-    base_url=st.session_state.api_url,
-    verify_ssl=True,
-    token=st.session_state.token,
+# pool of connections to the API: at most API_MAX_CONNECTIONS connections, API_MAX_KEEPALIVE of them kept open
+# for API_KEEPALIVE_EXPIRY seconds between the requests, HTTP/2 with API_HTTP2=1 (needs `pip install httpx[http2]`)
+pool_limits = httpx.Limits(
+    max_connections=int(os.getenv("API_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("API_MAX_KEEPALIVE", "10")),
+    keepalive_expiry=float(os.getenv("API_KEEPALIVE_EXPIRY", "30")),
 )
+http2 = os.getenv("API_HTTP2", "0") == "1"
+# seconds to wait for the requests sent together and for closing the connections
+api_timeout = float(os.getenv("API_TIMEOUT", "60"))
+
+
+# Client of a token kept between the reruns, so the connections to the API are reused instead of opened on every rerun.
+# The responses are kept in its ETag cache (the API answers 304 without the body while they did not change)
+# and its async requests run on an event loop of its own thread, which keeps the async connections usable.
+class ApiSession:
+    def __init__(self, token: str):
+        transport = ETagCacheTransport(
+            ETagCache(),
+            transport=httpx.HTTPTransport(verify=True, limits=pool_limits, http2=http2),
+            async_transport=httpx.AsyncHTTPTransport(verify=True, limits=pool_limits, http2=http2),
+        )
+        self.client = AuthenticatedClient(
+            base_url=st.session_state.api_url,
+            verify_ssl=True,
+            token=token,
+            httpx_args={"transport": transport},
+        )
+        # number of Streamlit sessions using the client, it is closed when the last one logs out
+        self.references = 0
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    # Send the requests concurrently and return their responses in the same order.
+    # Each request is a function taking the client and returning the coroutine of an asyncio_detailed function.
+    # Raises concurrent.futures.TimeoutError (and cancels the requests) when they did not all answer within api_timeout seconds.
+    def run_concurrently(self, *requests):
+        async def gather():
+            return await asyncio.gather(*(request(self.client) for request in requests))
+        future = asyncio.run_coroutine_threadsafe(gather(), self.loop)
+        try:
+            return future.result(api_timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    # close the connections and stop the event loop
+    def close(self):
+        try:
+            asyncio.run_coroutine_threadsafe(self.client.get_async_httpx_client().aclose(), self.loop).result(api_timeout)
+        finally:
+            self.client.get_httpx_client().close()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(api_timeout)
+
+
+# ApiSession of each logged in token and the lock guarding them, shared by the sessions of the process.
+# The tabs of a user share the ApiSession of the token, each Streamlit session holds one reference to it
+# (the token is kept in st.session_state.api_session_token) and releases it when logging out.
+@st.cache_resource
+def api_sessions():
+    return {}, threading.Lock()
+
+def get_api_session(token: str) -> ApiSession:
+    if st.session_state.get("api_session_token") not in (None, token):
+        release_api_session()
+    sessions, lock = api_sessions()
+    with lock:
+        if token not in sessions:
+            sessions[token] = ApiSession(token)
+        api_session = sessions[token]
+        if st.session_state.get("api_session_token") is None:
+            api_session.references += 1
+            st.session_state.api_session_token = token
+        return api_session
+
+# release the reference of the session to its ApiSession, closing it if no other session uses it
+def release_api_session():
+    token = st.session_state.pop("api_session_token", None)
+    sessions, lock = api_sessions()
+    with lock:
+        api_session = sessions.get(token)
+        if api_session is None:
+            return
+        api_session.references -= 1
+        if api_session.references > 0:
+            return
+        del sessions[token]
+    api_session.close()
+
+# close the client of the session and go back to the login form
+def logout():
+    release_api_session()
+    for key in ["token", "details_visible"]:
+        st.session_state.pop(key, None)
+    st.session_state.authenticated = False
+
+api_session = get_api_session(st.session_state.token)
+client = api_session.client
+run_concurrently = api_session.run_concurrently
+
+st.sidebar.button("Logout", on_click=logout)
+
+
+# Least recently used cache of the data fetched from the API, shared by the users of the process.
+# The entries belong to a version of the data on the API: the version is checked at most every version_ttl seconds
+# and the cache is emptied when it changes. An entry is also dropped ttl seconds after it was fetched.
+# The cached values are shared by the sessions and must not be modified.
+class DataCache:
+    def __init__(self, max_entries: int, ttl: float, version_ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version_ttl = version_ttl
+        self.version = None
+        self.version_checked_at = float("-inf")
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    # version of the data on the API, requested with fetch_version() when the last check is older than version_ttl
+    def check_version(self, fetch_version) -> str:
+        with self.lock:
+            if time.monotonic() - self.version_checked_at < self.version_ttl:
+                return self.version
+        version = fetch_version()
+        with self.lock:
+            if version != self.version:
+                self.entries.clear()
+                self.version = version
+            self.version_checked_at = time.monotonic()
+        return version
+
+    # cached values of the keys that did not expire, missing keys are left out
+    def get_many(self, keys) -> dict:
+        values = {}
+        with self.lock:
+            for key in keys:
+                if key in self.entries:
+                    fetched_at, value = self.entries[key]
+                    if time.monotonic() - fetched_at > self.ttl:
+                        del self.entries[key]
+                        continue
+                    self.entries.move_to_end(key)
+                    values[key] = value
+        return values
+
+    # keep the values fetched for the given version, dropped if the version changed meanwhile
+    def put_many(self, version: str, values: dict):
+        with self.lock:
+            if version != self.version:
+                return
+            for key, value in values.items():
+                self.entries[key] = (time.monotonic(), value)
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    # cached value of the key, fetch() is called and its value kept on a miss
+    def get(self, version: str, key, fetch):
+        values = self.get_many([key])
+        if key not in values:
+            values[key] = fetch()
+            self.put_many(version, values)
+        return values[key]
+
+
+# at most DASHBOARD_CACHE_ENTRIES entries (e.g. one per ride) kept for DASHBOARD_CACHE_TTL seconds,
+# the data version of the API is checked every DASHBOARD_VERSION_TTL seconds
+@st.cache_resource
+def data_cache() -> DataCache:
+    return DataCache(
+        max_entries=int(os.getenv("DASHBOARD_CACHE_ENTRIES", "256")),
+        ttl=float(os.getenv("DASHBOARD_CACHE_TTL", "3600")),
+        version_ttl=float(os.getenv("DASHBOARD_VERSION_TTL", "10")),
+    )
 
-# Get the data from the API for the overview
-with client as client:
-    # List rides
-    rides = check_response(list_ride_dashboard_rides_get.sync_detailed(client=client))
-    
-    # Get GPS data
-    gps_data = check_response(get_gps_data_dashboard_gps_get.sync_detailed(client=client))
-    
-    # Sample data for demonstration
-    num_rides = len(rides)
-    num_scenes = sum(ride['num_scenes'] for ride in rides)
-    num_samples = sum(ride['num_samples'] for ride in rides)
-    total_duration = sum(ride['duration'] for ride in rides) / 60  # assuming duration is in seconds
-    total_distance = sum(ride['distance'] for ride in rides)
-
-    # Calculate average metrics
-    avg_scenes_per_ride = num_scenes / num_rides if num_rides else 0
-    avg_samples_per_ride = num_samples / num_rides if num_rides else 0
-    avg_distance_per_ride = total_distance / num_rides if num_rides else 0
-    avg_duration_per_ride = total_duration / num_rides if num_rides else 0
-
-    # Define a function to render the navigation bar
-    def navigation_bar():
-        st.sidebar.title("Navigation")
-        if st.sidebar.button("Overview"):
-            st.session_state.page = "overview"
-        if st.sidebar.button("Rides"):
-            st.session_state.page = "rides"
-
-
-    # Initialize session state
-    if "page" not in st.session_state:
+cache = data_cache()
+data_version = cache.check_version(
+    lambda: check_response(get_data_version_admin_data_version_get.sync_detailed(client=client))["version"])
+
+# Define a function to render the navigation bar
+def navigation_bar():
+    st.sidebar.title("Navigation")
+    if st.sidebar.button("Overview"):
         st.session_state.page = "overview"
+    if st.sidebar.button("Rides"):
+        st.session_state.page = "rides"
+
+
+# Initialize session state
+if "page" not in st.session_state:
+    st.session_state.page = "overview"
+
+# Render the navigation bar
+navigation_bar()
+
+
+if st.session_state.page == "overview":
+    # 1. Streamlit Dashboard Title
+    st.title("Streamlit Dashboard")
+
+    # Get the totals, averages and number of rides per day (computed by the API when the data is loaded) and the
+    # GPS points counted by the API in cells of about 50m, from the cache or requested concurrently when missing
+    overview_requests = {
+        "summary": lambda async_client: get_summary_dashboard_summary_get.asyncio_detailed(client=async_client),
+        ("heatmap", 0.0005): lambda async_client: dataframes.asyncio_detailed(
+            get_gps_heatmap_dashboard_gps_heatmap_get, client=async_client, resolution=0.0005),
+    }
+    overview_data = cache.get_many(overview_requests)
+    missing_overview = [key for key in overview_requests if key not in overview_data]
+    responses = run_concurrently(*(overview_requests[key] for key in missing_overview))
+    fetched_overview = {key: check_response(response) for key, response in zip(missing_overview, responses)}
+    # Store the fetched data in the cache
+    cache.put_many(data_version, fetched_overview)
+    overview_data.update(fetched_overview)
+
+    summary = overview_data["summary"]
+    num_rides = summary["num_rides"]
+    num_scenes = summary["num_scenes"]
+    num_samples = summary["num_samples"]
+    total_duration = summary["total_duration"] / 60  # assuming duration is in seconds
+    total_distance = summary["total_distance"]
+    avg_scenes_per_ride = summary["avg_scenes"]
+    avg_samples_per_ride = summary["avg_samples"]
+    avg_distance_per_ride = summary["avg_distance"]
+    avg_duration_per_ride = summary["avg_duration"] / 60
+
+    # Create two columns: One for the "Summary of Important Metrics" and one for "Average Metrics"
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # 2. Summary of the Most Important Metrics
+        st.header("Summary of Important Metrics")
+
+        # Use st.columns within col1 to align metrics in rows
+        metric_col1, metric_col2 = st.columns(2)
+        with metric_col1:
+            st.metric(label="Number of rides", value=num_rides)
+            st.metric(label="Number of scenes", value=num_scenes)
+            st.metric(label="Number of samples", value=num_samples)
+        with metric_col2:
+            st.metric(label="Total driven duration", value= total_duration)
+            st.metric(label="Total distance in km", value=total_distance)
+
+    with col2:
+        # 3. Average Metrics Section
+        st.header("Average Metrics")
+
+        # Use st.columns within col2 to align metrics in rows
+        avg_metric_col1, avg_metric_col2 = st.columns(2)
+        with avg_metric_col1:
+            st.metric(label="Average scenes per ride", value=round(avg_scenes_per_ride, 2))
+            st.metric(label="Average samples per ride", value=round(avg_samples_per_ride, 2))
+        with avg_metric_col2:
+            st.metric(label="Average distance of a ride (km)", value=round(avg_distance_per_ride, 2))
+            st.metric(label="Average duration of a ride (min)", value=round(avg_duration_per_ride, 2))
+
+    # Show the number of rides over time.
+    # Convert the number of rides of each date to a DataFrame
+    rides_count_df = pd.DataFrame(summary["rides_per_day"], columns=["period", "rides"])
+    # Rename the columns for clarity
+    rides_count_df.columns = ['Time', 'Rides']
+    # create Line graph.
+    fig = px.bar(rides_count_df, x='Time', y='Rides', title='Rides over Time')
+    st.plotly_chart(fig, use_container_width=True)
+
+    # 4. GPS Overview Section
+    st.header("GPS Overview")
+
+    # Density is the number of GPS points of a cell, the map shows the centers of the cells instead of every GPS point
+    heatmap_data = overview_data[("heatmap", 0.0005)]
+
+    # Scatter plot example
+    scatter_fig = px.scatter_map(
+        heatmap_data, lat="Latitude", lon="Longitude",
+        zoom=12,
+        map_style="open-street-map"
+    )
+    st.plotly_chart(scatter_fig, use_container_width=True)
 
-    # Render the navigation bar
-    navigation_bar()
-
-
-    if st.session_state.page == "overview":
-        # 1. Streamlit Dashboard Title
-        st.title("Streamlit Dashboard")
-
-        # Create two columns: One for the "Summary of Important Metrics" and one for "Average Metrics"
-        col1, col2 = st.columns(2)
-
-        with col1:
-            # 2. Summary of the Most Important Metrics
-            st.header("Summary of Important Metrics")
-
-            # Use st.columns within col1 to align metrics in rows
-            metric_col1, metric_col2 = st.columns(2)
-            with metric_col1:
-                st.metric(label="Number of rides", value=num_rides)
-                st.metric(label="Number of scenes", value=num_scenes)
-                st.metric(label="Number of samples", value=num_samples)
-            with metric_col2:
-                st.metric(label="Total driven duration", value= total_duration)
-                st.metric(label="Total distance in km", value=total_distance)
-
-        with col2:
-            # 3. Average Metrics Section
-            st.header("Average Metrics")
-
-            # Use st.columns within col2 to align metrics in rows
-            avg_metric_col1, avg_metric_col2 = st.columns(2)
-            with avg_metric_col1:
-                st.metric(label="Average scenes per ride", value=round(avg_scenes_per_ride, 2))
-                st.metric(label="Average samples per ride", value=round(avg_samples_per_ride, 2))
-            with avg_metric_col2:
-                st.metric(label="Average distance of a ride (km)", value=round(avg_distance_per_ride, 2))
-                st.metric(label="Average duration of a ride (min)", value=round(avg_duration_per_ride, 2))
-
-        # Show the number of rides over time.
-        # Convert the list of rides to a DataFrame
-        rides_df = pd.DataFrame(rides)
-        # Group by 'date' and count the number of rides for each date
-        rides_count_df = rides_df.groupby('date').size().reset_index(name='Rides')
-        # Rename the columns for clarity
-        rides_count_df.columns = ['Time', 'Rides']
-        # create Line graph.
-        fig = px.bar(rides_count_df, x='Time', y='Rides', title='Rides over Time')
-        st.plotly_chart(fig, use_container_width=True)
-
-        # 4. GPS Overview Section
-        st.header("GPS Overview")
-
-        # Scatter plot example
-        scatter_fig = px.scatter_map(
-            pd.DataFrame(gps_data), lat="Latitude", lon="Longitude",
-            zoom=12,
-            map_style="open-street-map"
-        )
-        st.plotly_chart(scatter_fig, use_container_width=True)
+    # 5. Heatmap Section
+    st.header("Heatmap")
+
+    # Heatmap example
+    heatmap_fig = px.density_map(
+        heatmap_data, lat="Latitude", lon="Longitude", z="Density",
+        radius=10, center=dict(lat=48.137154, lon=11.576124),
+        map_style="open-street-map"
+    )
+    st.plotly_chart(heatmap_fig, use_container_width=True)
 
-        # 5. Heatmap Section
-        st.header("Heatmap")
+elif st.session_state.page == "rides":
+    st.title("Rides")
 
-        # Heatmap example
-        heatmap_fig = px.density_map(
-            pd.DataFrame(gps_data), lat="Latitude", lon="Longitude",
-            radius=10, center=dict(lat=48.137154, lon=11.576124),
-            map_style="open-street-map"
-        )
-        st.plotly_chart(heatmap_fig, use_container_width=True)
-
-    elif st.session_state.page == "rides":
-        st.title("Rides")
-
-        # Function to sort data
-        def sort_rides(data, sort_by, order):
-            return sorted(data, key=lambda x: x[sort_by], reverse=(order == "descending"))
-
-        # Search bar
-        search_query = st.text_input("Search for rides...", key="ride_search")
-
-        # Filters
-        col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
-        with col1:
-            sort_by = st.selectbox("Sort by", ["scenes", "samples", "duration", "distance"], key="sort_by")
-        with col2:
-            sort_order = st.selectbox("Select order", ["ascending", "descending"], key="sort_order")
-        with col3:
-            sort_button = st.button("Sort")
-        with col4:
-            reset_button = st.button("Reset all filters")
-
-        # Reset functionality
-        if reset_button:
-            del(st.session_state["ride_search"])
-            st.session_state["ride_search"] = ""
-            del(st.session_state["sort_by"])
-            st.session_state["sort_by"] = "scenes"
-            del(st.session_state["sort_order"])
-            st.session_state["sort_order"] = "ascending"
-
-        # Filtering and sorting
-        translation_dict = {"scenes": "num_scenes", "samples": "num_samples", "duration": "duration", "distance": "distance"} # Mapping for sorting
-        filtered_rides = rides
-        if search_query:
-            filtered_rides = [ride for ride in rides if search_query.lower() in ride["name"].lower()]
-        if sort_button:
-            filtered_rides = sort_rides(filtered_rides, translation_dict[st.session_state["sort_by"]], st.session_state["sort_order"])
-
-        # 'details_visible' should be initialized for each ride
-        if 'details_visible' not in st.session_state:
-            st.session_state.details_visible = {ride['name']: False for ride in rides} # dict with ride name as key and False as the details of none have been loaded
-            
-        # Initialize the ride_details state
-        if 'ride_details' not in st.session_state:
-            st.session_state.ride_details = {} # dict to store the details of the rides
-
-        # Display rides with buttons
-        st.write("### Available Rides")
-        for ride in filtered_rides:
-            with st.container():
-                details_visible = st.session_state.details_visible[ride['name']]
-
-                # Create a button for each ride
-                if st.button(f"{ride['name']}: {ride['num_scenes']} Scenes - {ride['num_samples']} Examples - "
-                            f"Duration: {ride['duration']} - Distance: {ride['distance']} m",
-                            key=f"btn_{ride['name']}"):
-                    st.session_state.details_visible[ride['name']] = not details_visible
-
-                # If details are visible, show them
-                if st.session_state.details_visible[ride['name']]:
-                    # Check if ride details are already fetched
-                    if ride['name'] not in st.session_state.ride_details:
-                        # Request the ride data from the API
-                        ride_details = check_response(get_ride_data_dashboard_ride_name_get.sync_detailed(client=client, ride_name=ride['name']))
-                        # Store the fetched data in the session state
-                        st.session_state.ride_details[ride['name']] = ride_details
-                    else:
-                        # Use the stored data
-                        ride_details = st.session_state.ride_details[ride['name']]
-                        
-                        
-                    # Display main ride details
-                    st.write(f"**Name of the Ride:** {ride_details['name']}")
-                    st.write("---")
-                    st.write("### Ride Details")
-                    with st.container():
-                        st.write(f"- **Date**: {ride_details['date']}")
-                        st.write(f"- **Time**: {ride_details['time']}")
-                        st.write(f"- **Number of Scenes**: {ride_details['num_scenes']}")
-                        st.write(f"- **Number of Samples**: {ride_details['num_samples']}")
-                        st.write(f"- **Duration**: {ride_details['duration']}")
-                        st.write(f"- **Distance**: {ride_details['distance']} m")
-
-                    # Scene filter
-                    st.write("### Filter: Select Scenes")
-                    available_scenes = [f"Scene {i + 1}" for i in range(ride_details["num_scenes"])]
-                    selected_scene = st.selectbox("Scenes", ["All Scenes"] + available_scenes, key=f"filter_{ride_details['name']}")
-
-                    # Display GPS information
-                    st.write("### GPS Information")
-                    gps_coordinates = ride_details["gps_coordinates"]  # Default to full ride data
-                    if selected_scene != "All Scenes":
-                        # Filter GPS data based on the selected scene
-                        st.write(f"Displaying GPS data for {selected_scene}.")
-
-                    # GPS Map (scatter plot equivalent)
-                    scatter_fig = px.scatter_map(
-                        lat=[coord[0] for coord in gps_coordinates],  # Latitude
-                        lon=[coord[1] for coord in gps_coordinates],  # Longitude
-                        zoom=12, map_style="open-street-map",
-                        title=f"GPS Information for {ride_details['name']}"
-                    )
-                    st.plotly_chart(scatter_fig, use_container_width=True)
-
-                    # GPS Heatmap
-                    st.write("### GPS Heatmap")
-                    heatmap_fig = px.density_map(
-                        lat=[coord[0] for coord in ride_details["gps_heatmap_data"]],  # Extract latitudes from the gps_heatmap_data
-                        lon=[coord[1] for coord in ride_details["gps_heatmap_data"]],  # Extract longitudes from the gps_heatmap_data
-                        radius=10,  # Adjust the radius of the heatmap points
-                        center=dict(lat=ride_details["gps_heatmap_data"][0][0], lon=ride_details["gps_heatmap_data"][0][1]),
-                        # Center the map based on the first data point
-                        map_style="open-street-map",  # Use a basic map style
-                        title=f"GPS Heatmap for {ride_details['name']}"
-                    )
-                    st.plotly_chart(heatmap_fig, use_container_width=True)
+    # List rides
+    rides = cache.get(data_version, "rides", lambda: check_response(list_ride_dashboard_rides_get.sync_detailed(client=client)))
+
+    # Function to sort data
+    def sort_rides(data, sort_by, order):
+        return sorted(data, key=lambda x: x[sort_by], reverse=(order == "descending"))
+
+    # Search bar
+    search_query = st.text_input("Search for rides...", key="ride_search")
+
+    # Filters
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
+    with col1:
+        sort_by = st.selectbox("Sort by", ["scenes", "samples", "duration", "distance"], key="sort_by")
+    with col2:
+        sort_order = st.selectbox("Select order", ["ascending", "descending"], key="sort_order")
+    with col3:
+        sort_button = st.button("Sort")
+    with col4:
+        reset_button = st.button("Reset all filters")
+
+    # Reset functionality
+    if reset_button:
+        del(st.session_state["ride_search"])
+        st.session_state["ride_search"] = ""
+        del(st.session_state["sort_by"])
+        st.session_state["sort_by"] = "scenes"
+        del(st.session_state["sort_order"])
+        st.session_state["sort_order"] = "ascending"
+
+    # Filtering and sorting
+    translation_dict = {"scenes": "num_scenes", "samples": "num_samples", "duration": "duration", "distance": "distance"} # Mapping for sorting
+    filtered_rides = rides
+    if search_query:
+        filtered_rides = [ride for ride in rides if search_query.lower() in ride["name"].lower()]
+    if sort_button:
+        filtered_rides = sort_rides(filtered_rides, translation_dict[st.session_state["sort_by"]], st.session_state["sort_order"])
+
+    # zoom level of the ride maps
+    ride_map_zoom = 12
+
+    # 'details_visible' should be initialized for each ride
+    if 'details_visible' not in st.session_state:
+        st.session_state.details_visible = {ride['name']: False for ride in rides} # dict with ride name as key and False as the details of none have been loaded
+        
+    # the buttons toggle the details in a callback, run before the rides are displayed
+    # (the rides loaded after the session started are hidden at first)
+    def toggle_details(ride_name):
+        st.session_state.details_visible[ride_name] = not st.session_state.details_visible.get(ride_name, False)
+
+    visible_rides = [ride['name'] for ride in filtered_rides if st.session_state.details_visible.get(ride['name'], False)]
+    # details of the visible rides, read from the cache (with ("ride", ride name, zoom) as key)
+    ride_details_by_name = {key[1]: value for key, value in cache.get_many([("ride", name, ride_map_zoom) for name in visible_rides]).items()}
+
+    # Request the details of all the visible rides that are not in the cache, with the GPS tracks simplified
+    # for the zoom level of the maps and sent as encoded polylines (precision of about 1m).
+    # The rides are requested by batches of at most max_batch_rides (the limit of the API), sent concurrently.
+    max_batch_rides = 100
+    missing_details = [name for name in visible_rides if name not in ride_details_by_name]
+    batches = [missing_details[i:i + max_batch_rides] for i in range(0, len(missing_details), max_batch_rides)]
+    responses = run_concurrently(*(
+        lambda async_client, batch=batch: get_rides_data_dashboard_rides_details_post.asyncio_detailed(
+            client=async_client, body=batch, zoom=ride_map_zoom, encoding="polyline", precision=5)
+        for batch in batches
+    ))
+    fetched_details = {}
+    for response in responses:
+        for ride_details in check_response(response):
+            ride_details["gps_coordinates"] = decode_gps(ride_details["gps_coordinates"])
+            fetched_details[("ride", ride_details['name'], ride_map_zoom)] = ride_details
+            ride_details_by_name[ride_details['name']] = ride_details
+    # Store the fetched data in the cache
+    cache.put_many(data_version, fetched_details)
+
+    # Display rides with buttons
+    st.write("### Available Rides")
+    for ride in filtered_rides:
+        with st.container():
+            # Create a button for each ride
+            st.button(f"{ride['name']}: {ride['num_scenes']} Scenes - {ride['num_samples']} Examples - "
+                      f"Duration: {ride['duration']} - Distance: {ride['distance']} m",
+                      key=f"btn_{ride['name']}", on_click=toggle_details, args=(ride['name'],))
+
+            # If details are visible, show them
+            if ride['name'] in ride_details_by_name:
+                # Use the fetched data
+                ride_details = ride_details_by_name[ride['name']]
+
+                # Display main ride details
+                st.write(f"**Name of the Ride:** {ride_details['name']}")
+                st.write("---")
+                st.write("### Ride Details")
+                with st.container():
+                    st.write(f"- **Date**: {ride_details['date']}")
+                    st.write(f"- **Time**: {ride_details['time']}")
+                    st.write(f"- **Number of Scenes**: {ride_details['num_scenes']}")
+                    st.write(f"- **Number of Samples**: {ride_details['num_samples']}")
+                    st.write(f"- **Duration**: {ride_details['duration']}")
+                    st.write(f"- **Distance**: {ride_details['distance']} m")
+
+                # Scene filter
+                st.write("### Filter: Select Scenes")
+                available_scenes = [f"Scene {i + 1}" for i in range(ride_details["num_scenes"])]
+                selected_scene = st.selectbox("Scenes", ["All Scenes"] + available_scenes, key=f"filter_{ride_details['name']}")
+
+                # Display GPS information
+                st.write("### GPS Information")
+                gps_coordinates = ride_details["gps_coordinates"]  # Default to full ride data
+                if selected_scene != "All Scenes":
+                    # Request only the data of the selected scene (its position in the ride starts from 0)
+                    scene = available_scenes.index(selected_scene)
+                    def fetch_scene():
+                        scene_details = check_response(get_scene_data_dashboard_ride_name_scenes_scene_get.sync_detailed(
+                            client=client, ride_name=ride_details['name'], scene=scene, zoom=ride_map_zoom, encoding="polyline", precision=5))
+                        scene_details["gps_coordinates"] = decode_gps(scene_details["gps_coordinates"])
+                        return scene_details
+                    scene_details = cache.get(data_version, ("scene", ride_details['name'], scene, ride_map_zoom), fetch_scene)
+                    st.write(f"Displaying GPS data for {selected_scene}: {scene_details['num_samples']} Samples - "
+                             f"from {scene_details['start']} to {scene_details['end']} ({scene_details['duration']} s)")
+                    gps_coordinates = scene_details["gps_coordinates"]
+                if not gps_coordinates:
+                    st.write("No GPS data.")
+                    continue
+
+                # GPS Map (scatter plot equivalent)
+                scatter_fig = px.scatter_map(
+                    lat=[coord[0] for coord in gps_coordinates],  # Latitude
+                    lon=[coord[1] for coord in gps_coordinates],  # Longitude
+                    zoom=ride_map_zoom, map_style="open-street-map",
+                    title=f"GPS Information for {ride_details['name']}"
+                )
+                st.plotly_chart(scatter_fig, use_container_width=True)
+
+                # GPS Heatmap
+                st.write("### GPS Heatmap")
+                heatmap_fig = px.density_map(
+                    lat=[coord[0] for coord in gps_coordinates],  # Latitude
+                    lon=[coord[1] for coord in gps_coordinates],  # Longitude
+                    radius=10,  # Adjust the radius of the heatmap points
+                    center=dict(lat=gps_coordinates[0][0], lon=gps_coordinates[0][1]),
+                    # Center the map based on the first data point
+                    map_style="open-street-map",  # Use a basic map style
+                    title=f"GPS Heatmap for {ride_details['name']}"
+                )
+                st.plotly_chart(heatmap_fig, use_container_width=True)
 
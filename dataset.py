@@ -0,0 +1,108 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# internal imports
+from snapshot_cache import SOURCE_FILES, source_key
+
+logger = logging.getLogger(__name__)
+
+
+# Natural order of the directories, database_csv_2 before database_csv_10
+def natural_key(path: str) -> List:
+    return [int(part) if part.isdigit() else part for part in re.split(r'(\d+)', path)]
+
+
+# True if all the csv files of a data directory are there
+def is_complete(path: str) -> bool:
+    return all(os.path.exists(os.path.join(path, file_name)) for file_name in SOURCE_FILES)
+
+
+# One immutable version of the loaded data.
+# A request reads dataset.current once and keeps using that version even if a refresh swaps in a new one.
+# parts holds what was loaded for each directory, the store combines the parts in the order of dir_paths.
+class DataVersion:
+    def __init__(self, store, dir_paths: List[str], keys: Dict[str, Dict], parts: Dict[str, object]):
+        self.store = store
+        self.dir_paths = dir_paths
+        self.keys = keys
+        self.parts = parts
+        # the version only depends on the source files so it is stable across restarts
+        self.version = hashlib.sha1(json.dumps(keys, sort_keys=True).encode()).hexdigest()[:16]
+        self.loaded_at = datetime.now(timezone.utc)
+
+
+# Loaded data with a background refresher.
+# load_parts loads each of the given directories, combine builds the store from the parts of all the directories.
+# New directories matching dir_pattern and directories whose csv files changed are picked up without a restart:
+# only the new and changed directories are loaded again, the parts of the other ones are reused from the current
+# version, and the new version replaces the current one in a single assignment.
+class Dataset:
+    def __init__(self, load_parts: Callable[[List[str]], List], combine: Callable[[List[str], List], object],
+                 dir_paths: List[str], dir_pattern: Optional[str] = None):
+        self.load_parts = load_parts
+        self.combine = combine
+        self.dir_pattern = dir_pattern
+        self.last_refresh: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.refresh_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.current = self.load_version(self.discover(dir_paths), {}, {})
+
+    # Directories to load: the given ones still complete, then the new complete directories matching the pattern.
+    # A directory deleted, renamed or missing csv files is dropped, it is picked up again once it is complete.
+    def discover(self, dir_paths: List[str]) -> List[str]:
+        dir_paths = [path for path in dir_paths if is_complete(path)]
+        if self.dir_pattern:
+            for path in sorted(glob.glob(self.dir_pattern), key=natural_key):
+                # a directory still being copied is skipped until all its csv files are there
+                if path not in dir_paths and is_complete(path):
+                    dir_paths.append(path)
+        return dir_paths
+
+    # Version of the directories, only the directories whose source key is not in keys are loaded,
+    # the parts of the other ones are taken from parts
+    def load_version(self, dir_paths: List[str], keys: Dict[str, Dict], parts: Dict[str, object]) -> DataVersion:
+        # the keys are taken before loading, so a file modified while it is loaded is loaded again by the next refresh
+        new_keys = {path: source_key(path) for path in dir_paths}
+        changed = [path for path in dir_paths if keys.get(path) != new_keys[path]]
+        new_parts = {path: parts[path] for path in dir_paths if path not in changed}
+        new_parts.update(zip(changed, self.load_parts(changed)))
+        return DataVersion(self.combine(dir_paths, [new_parts[path] for path in dir_paths]), dir_paths, new_keys, new_parts)
+
+    # Load a new version if the directories changed, returns True if the version was replaced
+    def refresh(self) -> bool:
+        with self.refresh_lock:
+            try:
+                dir_paths = self.discover(self.current.dir_paths)
+                if {path: source_key(path) for path in dir_paths} == self.current.keys:
+                    return False
+                self.current = self.load_version(dir_paths, self.current.keys, self.current.parts)
+                self.last_error = None
+                logger.info('Loaded data version %s', self.current.version)
+                return True
+            except Exception as error:
+                # keep serving the current version, files may be in the middle of being written
+                self.last_error = repr(error)
+                logger.exception('Data refresh failed')
+                return False
+            finally:
+                self.last_refresh = datetime.now(timezone.utc)
+
+    # Check for changes every interval seconds in a daemon thread
+    def start(self, interval: float) -> None:
+        def run():
+            while not self.stop_event.wait(interval):
+                self.refresh()
+        self.thread = threading.Thread(target=run, name='dataset-refresher', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
@@ -0,0 +1,241 @@
+from http import HTTPStatus
+from typing import Any, Optional, Union
+
+import httpx
+
+from ... import errors
+from ...client import AuthenticatedClient, Client
+from ...models.http_validation_error import HTTPValidationError
+from ...types import UNSET, Response, Unset
+
+
+def _get_kwargs(
+    *,
+    resolution: Union[Unset, float] = 0.001,
+    min_lat: Union[None, Unset, float] = UNSET,
+    min_lon: Union[None, Unset, float] = UNSET,
+    max_lat: Union[None, Unset, float] = UNSET,
+    max_lon: Union[None, Unset, float] = UNSET,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+
+    params["resolution"] = resolution
+
+    json_min_lat: Union[None, Unset, float]
+    if isinstance(min_lat, Unset):
+        json_min_lat = UNSET
+    else:
+        json_min_lat = min_lat
+    params["min_lat"] = json_min_lat
+
+    json_min_lon: Union[None, Unset, float]
+    if isinstance(min_lon, Unset):
+        json_min_lon = UNSET
+    else:
+        json_min_lon = min_lon
+    params["min_lon"] = json_min_lon
+
+    json_max_lat: Union[None, Unset, float]
+    if isinstance(max_lat, Unset):
+        json_max_lat = UNSET
+    else:
+        json_max_lat = max_lat
+    params["max_lat"] = json_max_lat
+
+    json_max_lon: Union[None, Unset, float]
+    if isinstance(max_lon, Unset):
+        json_max_lon = UNSET
+    else:
+        json_max_lon = max_lon
+    params["max_lon"] = json_max_lon
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: dict[str, Any] = {
+        "method": "get",
+        "url": "/dashboard/gps/heatmap",
+        "params": params,
+    }
+
+    return _kwargs
+
+
+def _parse_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Optional[Union[Any, HTTPValidationError]]:
+    if response.status_code == 200:
+        response_200 = response.json()
+        return response_200
+    if response.status_code == 422:
+        response_422 = HTTPValidationError.from_dict(response.json())
+
+        return response_422
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Response[Union[Any, HTTPValidationError]]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=_parse_response(client=client, response=response),
+    )
+
+
+def sync_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    resolution: Union[Unset, float] = 0.001,
+    min_lat: Union[None, Unset, float] = UNSET,
+    min_lon: Union[None, Unset, float] = UNSET,
+    max_lat: Union[None, Unset, float] = UNSET,
+    max_lon: Union[None, Unset, float] = UNSET,
+) -> Response[Union[Any, HTTPValidationError]]:
+    """Get Gps Heatmap
+
+    Args:
+        resolution (Union[Unset, float]):  Default: 0.001.
+        min_lat (Union[None, Unset, float]):
+        min_lon (Union[None, Unset, float]):
+        max_lat (Union[None, Unset, float]):
+        max_lon (Union[None, Unset, float]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Union[Any, HTTPValidationError]]
+    """
+
+    kwargs = _get_kwargs(
+        resolution=resolution,
+        min_lat=min_lat,
+        min_lon=min_lon,
+        max_lat=max_lat,
+        max_lon=max_lon,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    resolution: Union[Unset, float] = 0.001,
+    min_lat: Union[None, Unset, float] = UNSET,
+    min_lon: Union[None, Unset, float] = UNSET,
+    max_lat: Union[None, Unset, float] = UNSET,
+    max_lon: Union[None, Unset, float] = UNSET,
+) -> Optional[Union[Any, HTTPValidationError]]:
+    """Get Gps Heatmap
+
+    Args:
+        resolution (Union[Unset, float]):  Default: 0.001.
+        min_lat (Union[None, Unset, float]):
+        min_lon (Union[None, Unset, float]):
+        max_lat (Union[None, Unset, float]):
+        max_lon (Union[None, Unset, float]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[Any, HTTPValidationError]
+    """
+
+    return sync_detailed(
+        client=client,
+        resolution=resolution,
+        min_lat=min_lat,
+        min_lon=min_lon,
+        max_lat=max_lat,
+        max_lon=max_lon,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    resolution: Union[Unset, float] = 0.001,
+    min_lat: Union[None, Unset, float] = UNSET,
+    min_lon: Union[None, Unset, float] = UNSET,
+    max_lat: Union[None, Unset, float] = UNSET,
+    max_lon: Union[None, Unset, float] = UNSET,
+) -> Response[Union[Any, HTTPValidationError]]:
+    """Get Gps Heatmap
+
+    Args:
+        resolution (Union[Unset, float]):  Default: 0.001.
+        min_lat (Union[None, Unset, float]):
+        min_lon (Union[None, Unset, float]):
+        max_lat (Union[None, Unset, float]):
+        max_lon (Union[None, Unset, float]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Union[Any, HTTPValidationError]]
+    """
+
+    kwargs = _get_kwargs(
+        resolution=resolution,
+        min_lat=min_lat,
+        min_lon=min_lon,
+        max_lat=max_lat,
+        max_lon=max_lon,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    resolution: Union[Unset, float] = 0.001,
+    min_lat: Union[None, Unset, float] = UNSET,
+    min_lon: Union[None, Unset, float] = UNSET,
+    max_lat: Union[None, Unset, float] = UNSET,
+    max_lon: Union[None, Unset, float] = UNSET,
+) -> Optional[Union[Any, HTTPValidationError]]:
+    """Get Gps Heatmap
+
+    Args:
+        resolution (Union[Unset, float]):  Default: 0.001.
+        min_lat (Union[None, Unset, float]):
+        min_lon (Union[None, Unset, float]):
+        max_lat (Union[None, Unset, float]):
+        max_lon (Union[None, Unset, float]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[Any, HTTPValidationError]
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            resolution=resolution,
+            min_lat=min_lat,
+            min_lon=min_lon,
+            max_lat=max_lat,
+            max_lon=max_lon,
+        )
+    ).parsed
@@ -6,15 +6,48 @@ import httpx
 from ... import errors
 from ...client import AuthenticatedClient, Client
 from ...models.http_validation_error import HTTPValidationError
-from ...types import Response
+from ...types import UNSET, Response, Unset
 
 
 def _get_kwargs(
     ride_name: str,
+    *,
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
 ) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+
+    json_zoom: Union[None, Unset, float]
+    if isinstance(zoom, Unset):
+        json_zoom = UNSET
+    else:
+        json_zoom = zoom
+    params["zoom"] = json_zoom
+
+    json_tolerance: Union[None, Unset, float]
+    if isinstance(tolerance, Unset):
+        json_tolerance = UNSET
+    else:
+        json_tolerance = tolerance
+    params["tolerance"] = json_tolerance
+
+    json_encoding: Union[None, Unset, str]
+    if isinstance(encoding, Unset):
+        json_encoding = UNSET
+    else:
+        json_encoding = encoding
+    params["encoding"] = json_encoding
+
+    params["precision"] = precision
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
     _kwargs: dict[str, Any] = {
         "method": "get",
         "url": f"/dashboard/{ride_name}",
+        "params": params,
     }
 
     return _kwargs
@@ -51,11 +84,19 @@ def sync_detailed(
     ride_name: str,
     *,
     client: Union[AuthenticatedClient, Client],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
 ) -> Response[Union[Any, HTTPValidationError]]:
     """Get Ride Data
 
     Args:
         ride_name (str):
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
@@ -67,6 +108,10 @@ def sync_detailed(
 
     kwargs = _get_kwargs(
         ride_name=ride_name,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
     )
 
     response = client.get_httpx_client().request(
@@ -80,11 +125,19 @@ def sync(
     ride_name: str,
     *,
     client: Union[AuthenticatedClient, Client],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
 ) -> Optional[Union[Any, HTTPValidationError]]:
     """Get Ride Data
 
     Args:
         ride_name (str):
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
@@ -97,6 +150,10 @@ def sync(
     return sync_detailed(
         ride_name=ride_name,
         client=client,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
     ).parsed
 
 
@@ -104,11 +161,19 @@ async def asyncio_detailed(
     ride_name: str,
     *,
     client: Union[AuthenticatedClient, Client],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
 ) -> Response[Union[Any, HTTPValidationError]]:
     """Get Ride Data
 
     Args:
         ride_name (str):
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
@@ -120,6 +185,10 @@ async def asyncio_detailed(
 
     kwargs = _get_kwargs(
         ride_name=ride_name,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
     )
 
     response = await client.get_async_httpx_client().request(**kwargs)
@@ -131,11 +200,19 @@ async def asyncio(
     ride_name: str,
     *,
     client: Union[AuthenticatedClient, Client],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
 ) -> Optional[Union[Any, HTTPValidationError]]:
     """Get Ride Data
 
     Args:
         ride_name (str):
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
@@ -149,5 +226,9 @@ async def asyncio(
         await asyncio_detailed(
             ride_name=ride_name,
             client=client,
+            zoom=zoom,
+            tolerance=tolerance,
+            encoding=encoding,
+            precision=precision,
         )
     ).parsed
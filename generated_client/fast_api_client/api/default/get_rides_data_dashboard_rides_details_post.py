@@ -0,0 +1,242 @@
+from http import HTTPStatus
+from typing import Any, Optional, Union
+
+import httpx
+
+from ... import errors
+from ...client import AuthenticatedClient, Client
+from ...models.http_validation_error import HTTPValidationError
+from ...types import UNSET, Response, Unset
+
+
+def _get_kwargs(
+    *,
+    body: list[str],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> dict[str, Any]:
+    headers: dict[str, Any] = {}
+
+    params: dict[str, Any] = {}
+
+    json_zoom: Union[None, Unset, float]
+    if isinstance(zoom, Unset):
+        json_zoom = UNSET
+    else:
+        json_zoom = zoom
+    params["zoom"] = json_zoom
+
+    json_tolerance: Union[None, Unset, float]
+    if isinstance(tolerance, Unset):
+        json_tolerance = UNSET
+    else:
+        json_tolerance = tolerance
+    params["tolerance"] = json_tolerance
+
+    json_encoding: Union[None, Unset, str]
+    if isinstance(encoding, Unset):
+        json_encoding = UNSET
+    else:
+        json_encoding = encoding
+    params["encoding"] = json_encoding
+
+    params["precision"] = precision
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: dict[str, Any] = {
+        "method": "post",
+        "url": "/dashboard/rides/details",
+        "params": params,
+    }
+
+    _body = body
+
+    _kwargs["json"] = _body
+    headers["Content-Type"] = "application/json"
+
+    _kwargs["headers"] = headers
+    return _kwargs
+
+
+def _parse_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Optional[Union[Any, HTTPValidationError]]:
+    if response.status_code == 200:
+        response_200 = response.json()
+        return response_200
+    if response.status_code == 422:
+        response_422 = HTTPValidationError.from_dict(response.json())
+
+        return response_422
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Response[Union[Any, HTTPValidationError]]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=_parse_response(client=client, response=response),
+    )
+
+
+def sync_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    body: list[str],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> Response[Union[Any, HTTPValidationError]]:
+    """Get Rides Data
+
+    Args:
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
+        body (list[str]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Union[Any, HTTPValidationError]]
+    """
+
+    kwargs = _get_kwargs(
+        body=body,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    body: list[str],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> Optional[Union[Any, HTTPValidationError]]:
+    """Get Rides Data
+
+    Args:
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
+        body (list[str]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[Any, HTTPValidationError]
+    """
+
+    return sync_detailed(
+        client=client,
+        body=body,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    body: list[str],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> Response[Union[Any, HTTPValidationError]]:
+    """Get Rides Data
+
+    Args:
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
+        body (list[str]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Union[Any, HTTPValidationError]]
+    """
+
+    kwargs = _get_kwargs(
+        body=body,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    body: list[str],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> Optional[Union[Any, HTTPValidationError]]:
+    """Get Rides Data
+
+    Args:
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
+        body (list[str]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[Any, HTTPValidationError]
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            body=body,
+            zoom=zoom,
+            tolerance=tolerance,
+            encoding=encoding,
+            precision=precision,
+        )
+    ).parsed
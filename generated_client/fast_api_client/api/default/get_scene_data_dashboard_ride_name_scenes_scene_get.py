@@ -0,0 +1,247 @@
+from http import HTTPStatus
+from typing import Any, Optional, Union
+
+import httpx
+
+from ... import errors
+from ...client import AuthenticatedClient, Client
+from ...models.http_validation_error import HTTPValidationError
+from ...types import UNSET, Response, Unset
+
+
+def _get_kwargs(
+    ride_name: str,
+    scene: int,
+    *,
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+
+    json_zoom: Union[None, Unset, float]
+    if isinstance(zoom, Unset):
+        json_zoom = UNSET
+    else:
+        json_zoom = zoom
+    params["zoom"] = json_zoom
+
+    json_tolerance: Union[None, Unset, float]
+    if isinstance(tolerance, Unset):
+        json_tolerance = UNSET
+    else:
+        json_tolerance = tolerance
+    params["tolerance"] = json_tolerance
+
+    json_encoding: Union[None, Unset, str]
+    if isinstance(encoding, Unset):
+        json_encoding = UNSET
+    else:
+        json_encoding = encoding
+    params["encoding"] = json_encoding
+
+    params["precision"] = precision
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: dict[str, Any] = {
+        "method": "get",
+        "url": f"/dashboard/{ride_name}/scenes/{scene}",
+        "params": params,
+    }
+
+    return _kwargs
+
+
+def _parse_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Optional[Union[Any, HTTPValidationError]]:
+    if response.status_code == 200:
+        response_200 = response.json()
+        return response_200
+    if response.status_code == 422:
+        response_422 = HTTPValidationError.from_dict(response.json())
+
+        return response_422
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Response[Union[Any, HTTPValidationError]]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=_parse_response(client=client, response=response),
+    )
+
+
+def sync_detailed(
+    ride_name: str,
+    scene: int,
+    *,
+    client: Union[AuthenticatedClient, Client],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> Response[Union[Any, HTTPValidationError]]:
+    """Get Scene Data
+
+    Args:
+        ride_name (str):
+        scene (int):
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Union[Any, HTTPValidationError]]
+    """
+
+    kwargs = _get_kwargs(
+        ride_name=ride_name,
+        scene=scene,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    ride_name: str,
+    scene: int,
+    *,
+    client: Union[AuthenticatedClient, Client],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> Optional[Union[Any, HTTPValidationError]]:
+    """Get Scene Data
+
+    Args:
+        ride_name (str):
+        scene (int):
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[Any, HTTPValidationError]
+    """
+
+    return sync_detailed(
+        ride_name=ride_name,
+        scene=scene,
+        client=client,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
+    ).parsed
+
+
+async def asyncio_detailed(
+    ride_name: str,
+    scene: int,
+    *,
+    client: Union[AuthenticatedClient, Client],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> Response[Union[Any, HTTPValidationError]]:
+    """Get Scene Data
+
+    Args:
+        ride_name (str):
+        scene (int):
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Union[Any, HTTPValidationError]]
+    """
+
+    kwargs = _get_kwargs(
+        ride_name=ride_name,
+        scene=scene,
+        zoom=zoom,
+        tolerance=tolerance,
+        encoding=encoding,
+        precision=precision,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    ride_name: str,
+    scene: int,
+    *,
+    client: Union[AuthenticatedClient, Client],
+    zoom: Union[None, Unset, float] = UNSET,
+    tolerance: Union[None, Unset, float] = UNSET,
+    encoding: Union[None, Unset, str] = UNSET,
+    precision: Union[Unset, int] = 6,
+) -> Optional[Union[Any, HTTPValidationError]]:
+    """Get Scene Data
+
+    Args:
+        ride_name (str):
+        scene (int):
+        zoom (Union[None, Unset, float]):
+        tolerance (Union[None, Unset, float]):
+        encoding (Union[None, Unset, str]):
+        precision (Union[Unset, int]):  Default: 6.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[Any, HTTPValidationError]
+    """
+
+    return (
+        await asyncio_detailed(
+            ride_name=ride_name,
+            scene=scene,
+            client=client,
+            zoom=zoom,
+            tolerance=tolerance,
+            encoding=encoding,
+            precision=precision,
+        )
+    ).parsed
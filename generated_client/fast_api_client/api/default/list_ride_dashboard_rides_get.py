@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator, Iterator
 from http import HTTPStatus
 from typing import Any, Optional, Union
 
@@ -5,28 +6,62 @@ import httpx
 
 from ... import errors
 from ...client import AuthenticatedClient, Client
-from ...types import Response
+from ...models.http_validation_error import HTTPValidationError
+from ...pagination import aiter_pages, aiter_records, iter_pages, iter_records
+from ...types import UNSET, Response, Unset
 
 
-def _get_kwargs() -> dict[str, Any]:
+def _get_kwargs(
+    *,
+    cursor: Union[None, Unset, str] = UNSET,
+    limit: Union[None, Unset, int] = UNSET,
+) -> dict[str, Any]:
+    params: dict[str, Any] = {}
+
+    json_cursor: Union[None, Unset, str]
+    if isinstance(cursor, Unset):
+        json_cursor = UNSET
+    else:
+        json_cursor = cursor
+    params["cursor"] = json_cursor
+
+    json_limit: Union[None, Unset, int]
+    if isinstance(limit, Unset):
+        json_limit = UNSET
+    else:
+        json_limit = limit
+    params["limit"] = json_limit
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
     _kwargs: dict[str, Any] = {
         "method": "get",
         "url": "/dashboard/rides",
+        "params": params,
     }
 
     return _kwargs
 
 
-def _parse_response(*, client: Union[AuthenticatedClient, Client], response: httpx.Response) -> Optional[Any]:
+def _parse_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Optional[Union[Any, HTTPValidationError]]:
     if response.status_code == 200:
-        return response.json()
+        response_200 = response.json()
+        return response_200
+    if response.status_code == 422:
+        response_422 = HTTPValidationError.from_dict(response.json())
+
+        return response_422
     if client.raise_on_unexpected_status:
         raise errors.UnexpectedStatus(response.status_code, response.content)
     else:
         return None
 
 
-def _build_response(*, client: Union[AuthenticatedClient, Client], response: httpx.Response) -> Response[Any]:
+def _build_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Response[Union[Any, HTTPValidationError]]:
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
@@ -38,18 +73,27 @@ def _build_response(*, client: Union[AuthenticatedClient, Client], response: htt
 def sync_detailed(
     *,
     client: Union[AuthenticatedClient, Client],
-) -> Response[Any]:
+    cursor: Union[None, Unset, str] = UNSET,
+    limit: Union[None, Unset, int] = UNSET,
+) -> Response[Union[Any, HTTPValidationError]]:
     """List Ride
 
+    Args:
+        cursor (Union[None, Unset, str]):
+        limit (Union[None, Unset, int]):
+
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        Response[Any]
+        Response[Union[Any, HTTPValidationError]]
     """
 
-    kwargs = _get_kwargs()
+    kwargs = _get_kwargs(
+        cursor=cursor,
+        limit=limit,
+    )
 
     response = client.get_httpx_client().request(
         **kwargs,
@@ -58,22 +102,175 @@ def sync_detailed(
     return _build_response(client=client, response=response)
 
 
+def sync(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    cursor: Union[None, Unset, str] = UNSET,
+    limit: Union[None, Unset, int] = UNSET,
+) -> Optional[Union[Any, HTTPValidationError]]:
+    """List Ride
+
+    Args:
+        cursor (Union[None, Unset, str]):
+        limit (Union[None, Unset, int]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[Any, HTTPValidationError]
+    """
+
+    return sync_detailed(
+        client=client,
+        cursor=cursor,
+        limit=limit,
+    ).parsed
+
+
 async def asyncio_detailed(
     *,
     client: Union[AuthenticatedClient, Client],
-) -> Response[Any]:
+    cursor: Union[None, Unset, str] = UNSET,
+    limit: Union[None, Unset, int] = UNSET,
+) -> Response[Union[Any, HTTPValidationError]]:
     """List Ride
 
+    Args:
+        cursor (Union[None, Unset, str]):
+        limit (Union[None, Unset, int]):
+
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        Response[Any]
+        Response[Union[Any, HTTPValidationError]]
     """
 
-    kwargs = _get_kwargs()
+    kwargs = _get_kwargs(
+        cursor=cursor,
+        limit=limit,
+    )
 
     response = await client.get_async_httpx_client().request(**kwargs)
 
     return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    cursor: Union[None, Unset, str] = UNSET,
+    limit: Union[None, Unset, int] = UNSET,
+) -> Optional[Union[Any, HTTPValidationError]]:
+    """List Ride
+
+    Args:
+        cursor (Union[None, Unset, str]):
+        limit (Union[None, Unset, int]):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[Any, HTTPValidationError]
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            cursor=cursor,
+            limit=limit,
+        )
+    ).parsed
+
+
+def sync_pages(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    limit: int = 1000,
+) -> Iterator[list[Any]]:
+    """List Ride page by page, following the cursor of the next page
+
+    Args:
+        limit (int): Number of records per page. Default: 1000.
+
+    Raises:
+        errors.UnexpectedStatus: If a page is not returned with a 200 status code.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Iterator[list[Any]]
+    """
+
+    return iter_pages(client, lambda cursor: _get_kwargs(cursor=cursor, limit=limit))
+
+
+def sync_stream(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    cursor: Union[None, Unset, str] = UNSET,
+    limit: Union[None, Unset, int] = UNSET,
+) -> Iterator[Any]:
+    """List Ride streamed as NDJSON, one record at a time
+
+    Args:
+        cursor (Union[None, Unset, str]):
+        limit (Union[None, Unset, int]):
+
+    Raises:
+        errors.UnexpectedStatus: If the response does not have a 200 status code.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Iterator[Any]
+    """
+
+    return iter_records(client, _get_kwargs(cursor=cursor, limit=limit))
+
+
+def asyncio_pages(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    limit: int = 1000,
+) -> AsyncIterator[list[Any]]:
+    """List Ride page by page, following the cursor of the next page
+
+    Args:
+        limit (int): Number of records per page. Default: 1000.
+
+    Raises:
+        errors.UnexpectedStatus: If a page is not returned with a 200 status code.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        AsyncIterator[list[Any]]
+    """
+
+    return aiter_pages(client, lambda cursor: _get_kwargs(cursor=cursor, limit=limit))
+
+
+def asyncio_stream(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    cursor: Union[None, Unset, str] = UNSET,
+    limit: Union[None, Unset, int] = UNSET,
+) -> AsyncIterator[Any]:
+    """List Ride streamed as NDJSON, one record at a time
+
+    Args:
+        cursor (Union[None, Unset, str]):
+        limit (Union[None, Unset, int]):
+
+    Raises:
+        errors.UnexpectedStatus: If the response does not have a 200 status code.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        AsyncIterator[Any]
+    """
+
+    return aiter_records(client, _get_kwargs(cursor=cursor, limit=limit))
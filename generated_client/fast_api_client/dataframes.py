@@ -0,0 +1,115 @@
+"""Request the data endpoints in a binary format (Arrow IPC or MessagePack) and decode them into DataFrames
+
+pandas is needed, pyarrow and msgpack are optional: the formats of the installed libraries are requested,
+and a JSON response (from a server without these formats) is decoded as well.
+"""
+
+import json
+from http import HTTPStatus
+from types import ModuleType
+from typing import Any, Optional, Union
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from .client import AuthenticatedClient, Client
+from .types import Response
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+JSON_MEDIA_TYPE = "application/json"
+
+
+def accept_header() -> str:
+    """Accept header of the formats that can be decoded, the binary ones first"""
+    media_types = []
+    if pa is not None:
+        media_types.append(ARROW_MEDIA_TYPE)
+    if msgpack is not None:
+        media_types.append(f"{MSGPACK_MEDIA_TYPE};q=0.9")
+    media_types.append(f"{JSON_MEDIA_TYPE};q=0.5")
+    return ", ".join(media_types)
+
+
+def decode_dataframe(content_type: str, content: bytes) -> pd.DataFrame:
+    """Decode the columns of an Arrow IPC or MessagePack body, or the records of a JSON body
+
+    Args:
+        content_type: The Content-Type header of the response.
+        content: The body of the response.
+    """
+    if content_type.startswith(ARROW_MEDIA_TYPE):
+        return pa.ipc.open_stream(content).read_pandas()
+    if content_type.startswith(MSGPACK_MEDIA_TYPE):
+        columns = msgpack.unpackb(content)
+        return pd.DataFrame(
+            {
+                name: np.frombuffer(values["data"], dtype=values["dtype"]) if isinstance(values, dict) else values
+                for name, values in columns.items()
+            }
+        )
+    records = json.loads(content)
+    if isinstance(records, dict) and "points" in records:
+        # the points of the area endpoints, the rides are the distinct values of their ride column
+        records = records["points"]
+    return pd.DataFrame(records)
+
+
+def _build_response(response: httpx.Response) -> Response[Optional[pd.DataFrame]]:
+    parsed = None
+    if response.status_code == 200:
+        parsed = decode_dataframe(response.headers.get("content-type", ""), response.content)
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=parsed,
+    )
+
+
+def _dataframe_kwargs(endpoint: ModuleType, kwargs: dict[str, Any]) -> dict[str, Any]:
+    request_kwargs = endpoint._get_kwargs(**kwargs)
+    request_kwargs["headers"] = {**request_kwargs.get("headers", {}), "Accept": accept_header()}
+    return request_kwargs
+
+
+def sync_detailed(
+    endpoint: ModuleType, *, client: Union[AuthenticatedClient, Client], **kwargs: Any
+) -> Response[Optional[pd.DataFrame]]:
+    """Request an endpoint module of the api package in a binary format and decode the response into a DataFrame
+
+    Args:
+        endpoint: The endpoint module, for example api.default.get_gps_data_dashboard_gps_get.
+        client: The client used for the request.
+        kwargs: The parameters of the endpoint.
+
+    Raises:
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Optional[pd.DataFrame]], parsed is None if the status code is not 200
+    """
+
+    response = client.get_httpx_client().request(**_dataframe_kwargs(endpoint, kwargs))
+
+    return _build_response(response)
+
+
+async def asyncio_detailed(
+    endpoint: ModuleType, *, client: Union[AuthenticatedClient, Client], **kwargs: Any
+) -> Response[Optional[pd.DataFrame]]:
+    """Async version of sync_detailed"""
+
+    response = await client.get_async_httpx_client().request(**_dataframe_kwargs(endpoint, kwargs))
+
+    return _build_response(response)
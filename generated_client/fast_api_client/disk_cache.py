@@ -0,0 +1,127 @@
+"""On-disk HTTP cache for ETagCacheTransport, keeping the responses between runs
+
+Use it in place of the in-memory ETagCache, for example in scripts and notebooks run again and again:
+
+    transport = ETagCacheTransport(DiskETagCache("~/.cache/fast_api_client"))
+    client = AuthenticatedClient(base_url=..., token=..., httpx_args={"transport": transport})
+
+The kept responses are revalidated with If-None-Match as with ETagCache, so only the responses that changed
+are downloaded again. The key of a response is its URL, Accept header and a hash of the Authorization header:
+the responses of a token are not served to another one.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional, Union
+
+import httpx
+
+from .etag_cache import CachedEntry
+
+ENTRY_SUFFIX = ".entry"
+
+
+class DiskETagCache:
+    """Kept responses in a directory, at most max_bytes of files (least recently used first out)
+
+    Each response is a file named after the hash of its key: a JSON line with the ETag, the status code and the
+    headers, followed by the body. The files are written atomically, so several processes can share the directory,
+    the size limit is then enforced by each process on the files it knows of.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike], max_bytes: int = 1024 * 2**20):
+        self.directory = os.path.expanduser(os.fspath(directory))
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # size and last use of the files of the directory
+        self._files: dict[str, tuple[int, float]] = {}
+        for name in os.listdir(self.directory):
+            if name.endswith(ENTRY_SUFFIX):
+                stat = os.stat(os.path.join(self.directory, name))
+                self._files[name] = (stat.st_size, stat.st_mtime)
+        self._nbytes = sum(size for size, _ in self._files.values())
+        with self._lock:
+            self._evict()
+
+    @staticmethod
+    def _file_name(key: tuple[str, ...]) -> str:
+        return hashlib.sha256("\0".join(key).encode()).hexdigest() + ENTRY_SUFFIX
+
+    def _forget(self, name: str) -> None:
+        size, _ = self._files.pop(name, (0, 0.0))
+        self._nbytes -= size
+
+    def get(self, key: tuple[str, ...]) -> Optional[CachedEntry]:
+        name = self._file_name(key)
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as file:
+                line = file.readline()
+                content = file.read()
+            meta = json.loads(line)
+            # the modification time of the file is its last use
+            now = time.time()
+            os.utime(path, (now, now))
+        except (OSError, ValueError):
+            # missing (evicted by another process) or unreadable file
+            with self._lock:
+                self._forget(name)
+            return None
+        with self._lock:
+            self._forget(name)
+            self._files[name] = (len(line) + len(content), now)
+            self._nbytes += len(line) + len(content)
+        response = httpx.Response(meta["status_code"], headers=meta["headers"], content=content)
+        return CachedEntry(meta["etag"], response)
+
+    def put(self, key: tuple[str, ...], entry: CachedEntry) -> None:
+        if len(entry.content) > self.max_bytes:
+            return
+        name = self._file_name(key)
+        meta = {"etag": entry.etag, "status_code": entry.status_code, "headers": entry.headers}
+        data = json.dumps(meta).encode() + b"\n" + entry.content
+        # write a temporary file and rename it, so a reader never sees a partial file
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, os.path.join(self.directory, name))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        with self._lock:
+            self._forget(name)
+            self._files[name] = (len(data), time.time())
+            self._nbytes += len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used files until they fit in max_bytes, called with the lock held"""
+        while self._nbytes > self.max_bytes:
+            evicted = min(self._files, key=lambda file_name: self._files[file_name][1])
+            self._forget(evicted)
+            try:
+                os.remove(os.path.join(self.directory, evicted))
+            except FileNotFoundError:
+                pass
+
+    def clear(self) -> None:
+        """Forget the kept responses and remove their files"""
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith(ENTRY_SUFFIX):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except FileNotFoundError:
+                        pass
+            self._files.clear()
+            self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._files)
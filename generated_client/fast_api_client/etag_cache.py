@@ -0,0 +1,158 @@
+"""In-memory HTTP cache revalidating the responses with their ETag
+
+Use it as the transport of the client, for both the sync and the async requests:
+
+    client = AuthenticatedClient(base_url=..., token=..., httpx_args={"transport": ETagCacheTransport()})
+
+The GET responses with an ETag are kept, the next request for the same URL sends If-None-Match and a
+304 Not Modified answer is replaced by the kept response, so an unchanged response is not sent again.
+Pass the same ETagCache to the transports of several clients to share the kept responses,
+or a disk_cache.DiskETagCache to keep them between runs.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+import httpx
+
+# request headers changing the response, part of the cache key (the Authorization header is hashed)
+KEY_HEADERS = ("accept", "authorization")
+
+
+class CachedEntry:
+    def __init__(self, etag: str, response: httpx.Response):
+        self.etag = etag
+        self.status_code = response.status_code
+        # the content is kept decoded
+        self.headers = [
+            (name, value)
+            for name, value in response.headers.multi_items()
+            if name.lower() not in ("content-encoding", "content-length")
+        ]
+        self.content = response.content
+
+    def to_response(self, request: httpx.Request) -> httpx.Response:
+        return httpx.Response(self.status_code, headers=self.headers, content=self.content, request=request)
+
+
+class ResponseStore(Protocol):
+    """Interface of the caches used by ETagCacheTransport (ETagCache, disk_cache.DiskETagCache)"""
+
+    def get(self, key: tuple[str, ...]) -> Optional[CachedEntry]: ...
+
+    def put(self, key: tuple[str, ...], entry: CachedEntry) -> None: ...
+
+
+class ETagCache:
+    """Kept responses, at most max_bytes of bodies (least recently used first out)
+
+    A cache can outlive the transports using it, for example to keep the responses between client instances.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, ...], CachedEntry] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, ...]) -> Optional[CachedEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple[str, ...], entry: CachedEntry) -> None:
+        if len(entry.content) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= len(self._entries.pop(key).content)
+            self._entries[key] = entry
+            self._nbytes += len(entry.content)
+            while self._nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._nbytes -= len(evicted.content)
+
+    def clear(self) -> None:
+        """Forget the kept responses"""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ETagCacheTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Transport keeping the GET responses with an ETag in a cache and revalidating them
+
+    Args:
+        cache: The cache of the responses, a new ETagCache() by default (a DiskETagCache keeps them on disk).
+        transport: The sync transport sending the requests, httpx.HTTPTransport() by default.
+        async_transport: The async transport sending the requests, httpx.AsyncHTTPTransport() by default.
+
+    The transports are created without arguments by default: pass your own ones to set verify, cert or http2,
+    the arguments of the client are not applied to a custom transport.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ResponseStore] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.cache = cache if cache is not None else ETagCache()
+        self._transport = transport or httpx.HTTPTransport()
+        self._async_transport = async_transport or httpx.AsyncHTTPTransport()
+
+    @staticmethod
+    def cache_key(request: httpx.Request) -> tuple[str, ...]:
+        values = [request.headers.get(name, "") for name in KEY_HEADERS]
+        values[-1] = hashlib.sha256(values[-1].encode()).hexdigest()
+        return (str(request.url), *values)
+
+    def _lookup(self, request: httpx.Request) -> Optional[CachedEntry]:
+        """Kept response of the request, revalidated with If-None-Match (unless the request already has one)"""
+        if request.method != "GET" or "if-none-match" in request.headers:
+            return None
+        entry = self.cache.get(self.cache_key(request))
+        if entry is not None:
+            request.headers["If-None-Match"] = entry.etag
+        return entry
+
+    def _cacheable(self, request: httpx.Request, response: httpx.Response) -> bool:
+        return request.method == "GET" and response.status_code == 200 and "etag" in response.headers
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._lookup(request)
+        response = self._transport.handle_request(request)
+        if entry is not None and response.status_code == 304:
+            # the empty body is read so that the connection goes back to the pool instead of being closed
+            response.read()
+            response.close()
+            return entry.to_response(request)
+        if self._cacheable(request, response):
+            response.read()
+            self.cache.put(self.cache_key(request), CachedEntry(response.headers["etag"], response))
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._lookup(request)
+        response = await self._async_transport.handle_async_request(request)
+        if entry is not None and response.status_code == 304:
+            await response.aread()
+            await response.aclose()
+            return entry.to_response(request)
+        if self._cacheable(request, response):
+            await response.aread()
+            self.cache.put(self.cache_key(request), CachedEntry(response.headers["etag"], response))
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def aclose(self) -> None:
+        await self._async_transport.aclose()
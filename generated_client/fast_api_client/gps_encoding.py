@@ -0,0 +1,41 @@
+"""Decoders of the compact GPS encodings returned with the encoding query parameter"""
+
+from typing import Any, Union
+
+
+def decode_delta(coordinates: list[int], precision: int) -> list[list[float]]:
+    """Decode a flat list of rounded coordinates, each point given as the difference with the previous one"""
+    scale = 10**precision
+    points = []
+    lat = lon = 0
+    for i in range(0, len(coordinates) - 1, 2):
+        lat += coordinates[i]
+        lon += coordinates[i + 1]
+        points.append([lat / scale, lon / scale])
+    return points
+
+
+def decode_polyline(polyline: str, precision: int) -> list[list[float]]:
+    """Decode a Google encoded polyline of the given precision"""
+    values = []
+    value = shift = 0
+    for char in polyline:
+        chunk = ord(char) - 63
+        value |= (chunk & 0x1F) << shift
+        shift += 5
+        if not chunk & 0x20:
+            values.append(~(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    return decode_delta(values, precision)
+
+
+def decode_gps(encoded: dict[str, Any]) -> list[list[float]]:
+    """Decode the encoded coordinates of a response into [latitude, longitude] pairs
+
+    Args:
+        encoded: The encoded_gps object, with its encoding, precision and coordinates.
+    """
+    coordinates: Union[str, list[int]] = encoded["coordinates"]
+    if encoded["encoding"] == "polyline":
+        return decode_polyline(coordinates, encoded["precision"])
+    return decode_delta(coordinates, encoded["precision"])
@@ -0,0 +1,91 @@
+"""Helpers to read the paginated and streamed list endpoints incrementally"""
+
+import json
+from collections.abc import AsyncIterator, Iterator
+from typing import Any, Callable, Union
+
+import httpx
+
+from . import errors
+from .client import AuthenticatedClient, Client
+from .types import UNSET, Unset
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _check_status(response: httpx.Response) -> None:
+    if response.status_code != 200:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+
+
+def iter_pages(
+    client: Union[AuthenticatedClient, Client], get_kwargs: Callable[[Union[Unset, str]], dict[str, Any]]
+) -> Iterator[list[Any]]:
+    """Yield the pages of a list endpoint, following the cursor of the next page until the last one.
+
+    Args:
+        client: The client used for the requests.
+        get_kwargs: Builds the request kwargs of the page starting at the given cursor.
+
+    Raises:
+        errors.UnexpectedStatus: If a page is not returned with a 200 status code.
+    """
+    cursor: Union[Unset, str] = UNSET
+    while True:
+        response = client.get_httpx_client().request(**get_kwargs(cursor))
+        _check_status(response)
+        yield response.json()
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if next_cursor is None:
+            return
+        cursor = next_cursor
+
+
+async def aiter_pages(
+    client: Union[AuthenticatedClient, Client], get_kwargs: Callable[[Union[Unset, str]], dict[str, Any]]
+) -> AsyncIterator[list[Any]]:
+    """Async version of iter_pages"""
+    cursor: Union[Unset, str] = UNSET
+    while True:
+        response = await client.get_async_httpx_client().request(**get_kwargs(cursor))
+        _check_status(response)
+        yield response.json()
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if next_cursor is None:
+            return
+        cursor = next_cursor
+
+
+def _stream_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+    return {**kwargs, "headers": {**kwargs.get("headers", {}), "Accept": NDJSON_MEDIA_TYPE}}
+
+
+def iter_records(client: Union[AuthenticatedClient, Client], kwargs: dict[str, Any]) -> Iterator[Any]:
+    """Yield the records of a list endpoint streamed as NDJSON, as they are received.
+
+    Args:
+        client: The client used for the request.
+        kwargs: The request kwargs of the endpoint.
+
+    Raises:
+        errors.UnexpectedStatus: If the response does not have a 200 status code.
+    """
+    with client.get_httpx_client().stream(**_stream_kwargs(kwargs)) as response:
+        if response.status_code != 200:
+            response.read()
+        _check_status(response)
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
+
+async def aiter_records(client: Union[AuthenticatedClient, Client], kwargs: dict[str, Any]) -> AsyncIterator[Any]:
+    """Async version of iter_records"""
+    async with client.get_async_httpx_client().stream(**_stream_kwargs(kwargs)) as response:
+        if response.status_code != 200:
+            await response.aread()
+        _check_status(response)
+        async for line in response.aiter_lines():
+            if line:
+                yield json.loads(line)
@@ -0,0 +1,39 @@
+import numpy as np
+from typing import List
+
+# Compact encodings of GPS tracks, the coordinates are rounded to 10**-precision degrees (precision 6 is about 0.1m):
+# - 'delta': flat list [lat_0, lon_0, lat_1 - lat_0, lon_1 - lon_0, ...] of the rounded coordinates as integers
+# - 'polyline': Google encoded polyline of the rounded coordinates (the usual polylines use precision 5)
+ENCODINGS = ['delta', 'polyline']
+DEFAULT_PRECISION = 6
+
+
+# Rounded coordinates of the points and their difference with the previous point, shape (n, 2)
+def coordinate_deltas(lat: np.ndarray, lon: np.ndarray, precision: int) -> np.ndarray:
+    scale = 10 ** precision
+    quantized = np.round(np.column_stack((lat, lon)) * scale).astype(np.int64)
+    return np.diff(quantized, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+
+
+def delta_encode(lat: np.ndarray, lon: np.ndarray, precision: int = DEFAULT_PRECISION) -> List[int]:
+    return coordinate_deltas(lat, lon, precision).ravel().tolist()
+
+
+# Google polyline algorithm on all the values at once: each value is zigzag encoded (sign in the lowest bit),
+# then split in 5 bits chunks from the lowest ones, 0x20 marks the chunks followed by another chunk of the value
+def polyline_encode(lat: np.ndarray, lon: np.ndarray, precision: int = DEFAULT_PRECISION) -> str:
+    values = coordinate_deltas(lat, lon, precision).ravel()
+    values = np.where(values < 0, ~(values << 1), values << 1).astype(np.uint64)
+    num_chunks = np.ones(len(values), dtype=np.int64)
+    for k in range(1, 13):
+        num_chunks += values >= np.uint64(1 << (5 * k))
+    position = np.arange(num_chunks.max(initial=1))
+    chunks = (values[:, None] >> (5 * position).astype(np.uint64)) & np.uint64(0x1f)
+    chunks |= np.where(position < num_chunks[:, None] - 1, np.uint64(0x20), np.uint64(0))
+    return (chunks[position < num_chunks[:, None]] + np.uint64(63)).astype(np.uint8).tobytes().decode('ascii')
+
+
+# Encoded coordinates of the points in the given encoding
+def encode_gps(lat: np.ndarray, lon: np.ndarray, encoding: str, precision: int = DEFAULT_PRECISION) -> dict:
+    encode = polyline_encode if encoding == 'polyline' else delta_encode
+    return {'encoding': encoding, 'precision': precision, 'coordinates': encode(lat, lon, precision)}
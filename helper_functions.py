@@ -1,9 +1,28 @@
+import os
+import multiprocessing
+import numpy as np
 import pandas as pd
-from datetime import datetime
-from math import radians, cos, sin, asin, sqrt, isnan, isinf
+from concurrent.futures import ProcessPoolExecutor
+from math import isnan, isinf
 from typing import Tuple, List, Dict
 import json
 
+# internal imports
+from track_simplify import visvalingam_ranks
+from snapshot_cache import SourceChangedError, source_key, load_snapshot, load_snapshot_ride, ride_rows, save_snapshot
+
+# Compact dtypes of the large csv files. The tokens with missing values are read as floats and converted
+# once the rows without them are dropped, the timestamps are read as strings and parsed chunk by chunk.
+# Latitude, longitude and height keep full precision.
+SENSOR_CSV_DTYPES = {'token': 'int32', 'timestamp': 'object', 'sample_token': 'float64', 'scene_token': 'float64',
+                     'measurement_type': 'category', 'calibrated_sensor_name': 'category', 'sensor_data_type': 'category'}
+GPS_CSV_DTYPES = {'token': 'int32', 'lat': 'float64', 'lon': 'float64', 'hgt': 'float64',
+                  'lat_std': 'float32', 'lon_std': 'float32', 'hgt_std': 'float32'}
+# memory used to parse one chunk of a large csv file (the parsed rows kept for the directory come on top of it)
+DEFAULT_MEMORY_BUDGET = 256 * 2**20
+# column of the sensors of a linked directory with the simplification rank of the GPS measurements (see rank_gps)
+GPS_RANK = 'gps_rank'
+
 # Function to handle NaN and infinite values
 def handle_special_floats(data):
     if isinstance(data, list):
@@ -15,84 +34,274 @@ def handle_special_floats(data):
     else:
         return data
     
+# Number of rows of a csv file to parse at once to stay within the memory budget
+def chunk_rows(path: str, memory_budget: int) -> int:
+    with open(path, 'rb') as f:
+        head = f.read(1 << 16)
+    line_bytes = max(len(head) / max(head.count(b'\n'), 1), 1)
+    # a parsed row takes a few times its size in text (python strings, intermediate arrays)
+    return max(int(memory_budget / (line_bytes * 8)), 1000)
+
+
+# Concatenate chunks, merging the categories of the categorical columns instead of falling back to strings
+def concat_chunks(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    for column in chunks[0].columns:
+        if isinstance(chunks[0][column].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals([chunk[column] for chunk in chunks]).categories
+            for chunk in chunks:
+                chunk[column] = chunk[column].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+# Read a large csv file chunk by chunk with compact dtypes.
+# Each chunk goes through prepare (filtering, joins) before the next one is parsed, so only the compact result
+# and a single chunk being parsed are in memory at the same time.
+def read_csv_chunked(path: str, dtypes: Dict[str, str], memory_budget: int, prepare=None) -> pd.DataFrame:
+    reader = pd.read_csv(path, header=None, names=list(dtypes), dtype=dtypes, skiprows=1,
+                         chunksize=chunk_rows(path, memory_budget))
+    chunks = [prepare(chunk) if prepare else chunk for chunk in reader]
+    if len(chunks) == 0:
+        empty = pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in dtypes.items()})
+        chunks = [prepare(empty) if prepare else empty]
+    return concat_chunks(chunks)
+
+
+# Read the csv files of a directory and join the sensors with their GPS measurement.
+# The timestamps of the samples and sensors are parsed to datetime64[ns].
+def read_directory(path: str, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    dir_rides = pd.read_csv(f"{path}/rides.csv", header=None, names=['token', 'name'], skiprows=1).astype({'token':int})
+    dir_scenes_list = pd.read_csv(f"{path}/scenes.csv", header=None, names=['token', 'ride_token', 'dir_name'], skiprows=1).astype({'token':int,'ride_token':int})
+    dir_sample_list = pd.read_csv(f"{path}/samples.csv", header=None, names=['token', 'scene_token', 'timestamp', 'prev_sample_token'], skiprows=1).dropna(subset=['scene_token']).astype({'token':int,'scene_token':int})
+    dir_sample_list['timestamp'] = parse_timestamps(dir_sample_list['timestamp'])
+    dir_gps_data = read_csv_chunked(f"{path}/gps_data.csv", GPS_CSV_DTYPES, memory_budget)
+    # GPS
+    # Merge Gps with each chunk of sensor data on token (a left merge keeps the sensor order)
+    def prepare_sensors(chunk: pd.DataFrame) -> pd.DataFrame:
+        chunk = chunk.dropna(subset=['sample_token']).astype({'scene_token':'int32', 'sample_token':'int32'})
+        chunk['timestamp'] = parse_timestamps(chunk['timestamp'])
+        return pd.merge(chunk, dir_gps_data, on='token', how='left')
+    dir_sensor_list = read_csv_chunked(f"{path}/sensor_data.csv", SENSOR_CSV_DTYPES, memory_budget, prepare_sensors)
+    return dir_rides, dir_scenes_list, dir_sample_list, dir_sensor_list
+
+
+# Read and link a directory (see link_directory) and rank its GPS measurements (see rank_gps), from its binary
+# snapshot when the csv files did not change since it was written, otherwise parse the csv files and write a new snapshot
+def load_directory(path: str, cache: bool = True, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Tuple:
+    if not cache:
+        return rank_gps(link_directory(read_directory(path, memory_budget)))
+    key = source_key(path)
+    linked = load_snapshot(path, key)
+    if linked is None:
+        linked = rank_gps(link_directory(read_directory(path, memory_budget)))
+        save_snapshot(path, key, linked)
+    return linked
+
+
+# Linked frames of a single ride of a directory (its position among the rides with scenes, see link_directory),
+# indexed while the csv files had the given source key. Only the rows of the ride are read from the snapshot when it
+# was written for this key, otherwise the directory is loaded (and its snapshot written) and the rows of the ride are
+# copied out of it. Raises SourceChangedError if the csv files changed since: the ride may be at another position.
+def load_ride(path: str, position: int, key: Dict, cache: bool = True, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Tuple:
+    if cache:
+        linked = load_snapshot_ride(path, key, position)
+        if linked is not None:
+            return linked
+    if source_key(path) != key:
+        raise SourceChangedError(path)
+    return slice_ride(load_directory(path, cache, memory_budget), position)
+
+
+# Rows of a single ride of a linked directory, as a linked directory of one ride
+def slice_ride(linked: Tuple, position: int) -> Tuple:
+    offsets = [np.concatenate(([0], np.cumsum(counts))) for counts in linked[4:]]
+    rows, counts = ride_rows(offsets, position)
+    frames = [df.iloc[start:end].reset_index(drop=True) for df, (start, end) in zip(linked[:4], rows)]
+    return (*frames, *counts)
+
+
+# Apply function(path, *args) to each directory, each one in its own worker process when more than one worker is
+# requested. workers <= 0 uses one worker per CPU core.
+def map_directories(function, dir_paths: list, workers: int, *args) -> List:
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(dir_paths))
+    if workers <= 1:
+        return [function(path, *args) for path in dir_paths]
+    # the directories are independent, the results come back in the order of dir_paths. The workers are spawned
+    # rather than forked: the API loads from its refresher thread, and a forked child would inherit the locks
+    # other threads of the server hold at that moment.
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(function, dir_paths, *[[arg] * len(dir_paths) for arg in args]))
+
+
+# Read and link the directories (see load_directory and map_directories)
+def load_directories(dir_paths: list, cache: bool = True, workers: int = 1,
+                     memory_budget: int = DEFAULT_MEMORY_BUDGET) -> List[Tuple]:
+    return map_directories(load_directory, dir_paths, workers, cache, memory_budget)
+
+
+# Records of the rows of a linked level split by parent, counts is the number of children of each parent
+def split_records(df: pd.DataFrame, counts: np.ndarray) -> List[List[Dict]]:
+    records = df.to_dict(orient='records')
+    offsets = np.concatenate(([0], np.cumsum(counts))).tolist()
+    return [records[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+# Attach the children to their parent (the rows of parents are in store order and hold the parent keys in
+# child_keys), keeping the file order of the children of a same parent.
+# Returns the children in store order and the number of children of each parent.
+def link_children(parents: pd.DataFrame, children: pd.DataFrame, child_keys: List[str]) -> Tuple[pd.DataFrame, np.ndarray]:
+    keys = parents[child_keys].assign(_parent=np.arange(len(parents)))
+    columns = list(children.columns)
+    children = children.reset_index(drop=True).assign(_order=np.arange(len(children)))
+    linked = keys.merge(children, on=child_keys).sort_values(['_parent', '_order'], kind='stable')
+    counts = np.bincount(linked['_parent'].to_numpy(), minlength=len(parents))
+    # the columns of the children in their original order
+    return linked[columns].reset_index(drop=True), counts
+
+
+# Order the frames of a directory as ride -> scene -> sample -> sensor, skipping the rides without scenes.
+# Returns the rides, scenes, samples and sensors frames and the number of children of each ride, scene and sample:
+# the children of a row are contiguous, so a ride is a slice of every level. Linking a linked directory changes nothing.
+def link_directory(frames: Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.DataFrame]) -> Tuple:
+    dir_rides, dir_scenes_list, dir_sample_list, dir_sensor_list = frames
+    rides = dir_rides[dir_rides['token'].isin(dir_scenes_list['ride_token'])].reset_index(drop=True)
+    scenes, scene_counts = link_children(rides.rename(columns={'token': 'ride_token'}), dir_scenes_list, ['ride_token'])
+    samples, sample_counts = link_children(scenes.rename(columns={'token': 'scene_token'}), dir_sample_list, ['scene_token'])
+    sensors, sensor_counts = link_children(samples.rename(columns={'token': 'sample_token'}), dir_sensor_list, ['scene_token', 'sample_token'])
+    return rides, scenes, samples, sensors, scene_counts, sample_counts, sensor_counts
+
+
+# Simplification ranks (see track_simplify.visvalingam_ranks) of the valid GPS measurements of each ride of a linked
+# directory, in sensor order, added to the sensors as the GPS_RANK column (NaN for the other measurements)
+def rank_gps(linked: Tuple) -> Tuple:
+    rides, scenes, samples, sensors, scene_counts, sample_counts, sensor_counts = linked
+    ride_of_sensor = np.repeat(np.repeat(np.repeat(np.arange(len(rides)), scene_counts), sample_counts), sensor_counts)
+    lat = sensors['lat'].to_numpy(dtype=np.float64)
+    lon = sensors['lon'].to_numpy(dtype=np.float64)
+    points = np.flatnonzero(valid_gps(lat, lon, sensors['hgt'].to_numpy(dtype=np.float64)))
+    # the points of a ride are contiguous
+    bounds = np.searchsorted(ride_of_sensor[points], np.arange(len(rides) + 1))
+    ranks = np.full(len(sensors), np.nan)
+    for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+        ride_points = points[start:end]
+        ranks[ride_points] = visvalingam_ranks(lat[ride_points], lon[ride_points])
+    return rides, scenes, samples, sensors.assign(**{GPS_RANK: ranks}), scene_counts, sample_counts, sensor_counts
+
+
+# Parse timestamps like 2023-09-29 14:48:46.745031 (missing ones become NaT)
+def parse_timestamps(values: pd.Series) -> pd.Series:
+    return pd.to_datetime(values, format='ISO8601').astype('datetime64[ns]')
+
+
+# Format parsed timestamps back to the format of the csv files (missing ones become NaN)
+def format_timestamps(values: pd.Series) -> pd.Series:
+    return values.dt.strftime('%Y-%m-%d %H:%M:%S.%f')
+
+
+# Positions of the valid GPS measurements: missing values and (0, 0, 0) placeholders are skipped
+def valid_gps(lat: np.ndarray, lon: np.ndarray, hgt: np.ndarray) -> np.ndarray:
+    return ~(np.isnan(lat) | np.isnan(lon) | np.isnan(hgt)) & ((lat != 0) | (lon != 0) | (hgt != 0))
+
+
+# Summary of each ride of a linked directory (see link_directory).
+# The duration goes from the first to the last sample of the ride. The distance is the length of the GPS track of
+# each scene of the ride, with the points of a scene ordered by timestamp.
+def summarize_rides(rides: pd.DataFrame, scenes: pd.DataFrame, samples: pd.DataFrame, sensors: pd.DataFrame,
+                    scene_counts: np.ndarray, sample_counts: np.ndarray, sensor_counts: np.ndarray) -> pd.DataFrame:
+    num_rides = len(rides)
+    # ride and scene of every sample and sensor
+    ride_of_scene = np.repeat(np.arange(num_rides), scene_counts)
+    ride_of_sample = np.repeat(ride_of_scene, sample_counts)
+    scene_of_sensor = np.repeat(np.repeat(np.arange(len(scenes)), sample_counts), sensor_counts)
+    ride_of_sensor = ride_of_scene[scene_of_sensor]
+
+    # DURATION / TIME
+    times = samples['timestamp'].to_numpy()
+    known = ~np.isnat(times)
+    start = np.full(num_rides, np.iinfo(np.int64).max, dtype=np.int64)
+    end = np.full(num_rides, np.iinfo(np.int64).min, dtype=np.int64)
+    np.minimum.at(start, ride_of_sample[known], times[known].view(np.int64))
+    np.maximum.at(end, ride_of_sample[known], times[known].view(np.int64))
+    has_time = end >= start
+    start_times = pd.DatetimeIndex(np.where(has_time, start, np.datetime64('NaT').view(np.int64)).view('datetime64[ns]'))
+
+    # DISTANCE
+    lat = sensors['lat'].to_numpy(dtype=np.float64)
+    lon = sensors['lon'].to_numpy(dtype=np.float64)
+    points = np.flatnonzero(valid_gps(lat, lon, sensors['hgt'].to_numpy(dtype=np.float64)))
+    # order the points of each scene by timestamp, scenes are already in store order
+    points = points[np.lexsort((sensors['timestamp'].to_numpy()[points], scene_of_sensor[points]))]
+    same_scene = scene_of_sensor[points[1:]] == scene_of_sensor[points[:-1]]
+    steps = haversine(lat[points[:-1]], lon[points[:-1]], lat[points[1:]], lon[points[1:]])
+    distance = np.bincount(ride_of_sensor[points[1:]][same_scene], weights=steps[same_scene], minlength=num_rides)
+
+    return pd.DataFrame({
+        'duration': np.where(has_time, (end - start) / 1e9, 0.0),
+        'date': np.where(has_time, start_times.strftime("%Y-%m-%d"), ''),
+        'time': np.where(has_time, start_times.strftime("%H:%M:%S"), ''),
+        'distance': distance,
+        'num_scenes': np.asarray(scene_counts, dtype=np.int32),
+        'num_samples': np.bincount(ride_of_sample, minlength=num_rides).astype(np.int32),
+    })
+
+
 # Extract all important data lists
-def get_data(dir_paths: list) -> List[Dict]:
+def get_data(dir_paths: list, cache: bool = True, workers: int = 1, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> List[Dict]:
+    # read the csv files
+    return assemble_rides(load_directories(dir_paths, cache, workers, memory_budget))
+
+
+# Nested ride -> scene -> sample -> sensor dicts of the linked directories
+def assemble_rides(directories: List[Tuple]) -> List[Dict]:
     rides_data = []
     # iterete through each directory
-    for i, path in enumerate(dir_paths):
-        # read the csv files
-        dir_rides = pd.read_csv(f"{path}/rides.csv", header=None, names=['token', 'name'], skiprows=1).astype({'token':int}).to_dict(orient='records')
-        dir_scenes_list = pd.read_csv(f"{path}/scenes.csv", header=None, names=['token', 'ride_token', 'dir_name'], skiprows=1).astype({'token':int,'ride_token':int})
-        dir_sample_list = pd.read_csv(f"{path}/samples.csv", header=None, names=['token', 'scene_token', 'timestamp', 'prev_sample_token'], skiprows=1).dropna(subset=['scene_token']).astype({'token':int,'scene_token':int})
-        dir_sensor_list = pd.read_csv(f"{path}/sensor_data.csv", header=None, names=[
-            'token', 'timestamp', 'sample_token', 'scene_token', 'measurement_type', 'calibrated_sensor_name',
-            'sensor_data_type'], skiprows=1, low_memory=False).dropna(subset=['sample_token']).astype({'token':int,'scene_token':int, 'sample_token':int})
-        dir_gps_data = pd.read_csv(f"{path}/gps_data.csv", header=None,
-                                names=['token', 'lat', 'lon', 'hgt', 'lat_std', 'lon_std', 'hgt_std'], skiprows=1)
-        for ride in dir_rides:
+    for i, linked in enumerate(directories):
+        dir_rides, dir_scenes_list, dir_sample_list, dir_sensor_list, scene_counts, sample_counts, sensor_counts = linked
+        # DURATION / TIME / DISTANCE
+        # computed on the arrays of the directory, in the order of the rides
+        summaries = summarize_rides(*linked).to_dict(orient='records')
+        # the timestamps are returned as in the csv files
+        dir_sample_list = dir_sample_list.assign(timestamp=format_timestamps(dir_sample_list['timestamp']))
+        dir_sensor_list = dir_sensor_list.assign(timestamp=format_timestamps(dir_sensor_list['timestamp']))
+        # the ranks are only used to simplify the tracks returned by the API
+        dir_sensor_list = dir_sensor_list.drop(columns=GPS_RANK)
+        # the children of each row are contiguous in the next level
+        scenes = iter(split_records(dir_scenes_list, scene_counts))
+        samples = iter(split_records(dir_sample_list, sample_counts))
+        sensors = iter(split_records(dir_sensor_list, sensor_counts))
+        for ride, summary in zip(dir_rides.to_dict(orient='records'), summaries):
             # RIDES
             ride['directory_token'] = i
             # SCENES
-            ride['scenes'] = dir_scenes_list[dir_scenes_list['ride_token'] == ride['token']].to_dict(orient='records')
+            ride['scenes'] = next(scenes)
             # SAMPLES
             for scene in ride['scenes']:
-                scene['samples'] = dir_sample_list[dir_sample_list['scene_token'] == scene['token']].to_dict(orient='records')
+                scene['samples'] = next(samples)
             # SENSORS
                 for sample in scene['samples']:
-                    sample['sensors'] = dir_sensor_list[(dir_sensor_list['scene_token'] == scene['token']) & (dir_sensor_list['sample_token'] == sample['token'])]
-            # GPS
-            # Merge Gps with sensor data on token
-                    sample['sensors'] = pd.merge(sample['sensors'],dir_gps_data,on='token',how='left').to_dict(orient='records')
-            if len(ride['scenes']) > 0:
-                    rides_data.append(ride)
-                    
-    # DURATION / TIME
-    # Extract the duration from the sensor data for each scene -> timestamp example: 2023-09-29 14:48:46.745031
-    for ride in rides_data:
-        times = sorted(
-            [datetime.strptime(sample['timestamp'], "%Y-%m-%d %H:%M:%S.%f") for sample in scene['samples'] for scene in ride['scenes']],
-            key=lambda x: x
-            )
-        ride['duration'] = (times[-1] - times[0]).total_seconds()
-        ride['date'] = times[0].strftime("%Y-%m-%d")
-        ride['time'] = times[0].strftime("%H:%M:%S")
-
-        # DISTANCE
-        ride['distance'] = calculate_total_distance(ride)
-        ride['num_scenes'] = len(ride['scenes'])
-        ride['num_samples'] = sum([len(scene['samples']) for scene in ride['scenes']])
-            
-    return handle_special_floats(rides_data)
+                    sample['sensors'] = next(sensors)
+            ride.update(summary)
+            rides_data.append(ride)
 
-
-# Calculate total distance from a ride element in the return object of merge_data
-def calculate_total_distance(ride: dict) -> float:
-    distance = 0.0
-    for scene in ride['scenes']:
-        for sample in scene['samples']:
-            coords = sorted(
-                [sensor for sensor in sample['sensors'] if not isnan(sensor['lat'])],
-                key=lambda x: datetime.strptime(x['timestamp'], "%Y-%m-%d %H:%M:%S.%f")
-            )
-            for i in range(1, len(coords),1):
-                distance += haversine(coords[i]['lat'], coords[i]['lon'], coords[i-1]['lat'], coords[i-1]['lon'])
-    return distance
+    return handle_special_floats(rides_data)
 
 
-# Haversine formula to calculate distances between two points on the earth in km
-def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+# Haversine formula to calculate distances between two points on the earth in km.
+# Works on floats and element-wise on arrays.
+def haversine(lat1, lon1, lat2, lon2):
     # Convert degrees to radians
-    lat1_rad = radians(lat1)
-    lon1_rad = radians(lon1)
-    lat2_rad = radians(lat2)
-    lon2_rad = radians(lon2)
+    lat1_rad = np.radians(lat1)
+    lon1_rad = np.radians(lon1)
+    lat2_rad = np.radians(lat2)
+    lon2_rad = np.radians(lon2)
     # Cal Distance using haversine forumla
     # Source: https://www.geeksforgeeks.org/program-distance-two-points-earth/
     # Differences in coordinates
     dlat = lat2_rad - lat1_rad
     dlon = lon2_rad - lon1_rad
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    c = 2 * asin(sqrt(a))
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arcsin(np.sqrt(a))
     # Radius of earth in kilometers
     r = 6371
     return c * r
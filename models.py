@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional, Union
 
 class compressed_ride(BaseModel):
     token: int
@@ -17,6 +17,33 @@ class aggregated_gps(BaseModel):
     Longitude: float
     Density: float
 
+class located_gps(BaseModel):
+    ride: str
+    sample_token: int
+    Latitude: float
+    Longitude: float
+
+class gps_area(BaseModel):
+    rides: List[str]
+    points: List[located_gps]
+
+class ride_count(BaseModel):
+    period: str
+    rides: int
+
+class overview_summary(BaseModel):
+    num_rides: int
+    num_scenes: int
+    num_samples: int
+    total_duration: float
+    total_distance: float
+    avg_scenes: float
+    avg_samples: float
+    avg_duration: float
+    avg_distance: float
+    rides_per_day: List[ride_count]
+    rides_per_week: List[ride_count]
+
 class ride_data(BaseModel):
     name: str
     duration: float
@@ -26,4 +53,61 @@ class ride_data(BaseModel):
     num_scenes: int
     num_samples: int
     gps_coordinates: List[List[float]]
-    gps_heatmap_data: List[List[float]]
+
+class encoded_gps(BaseModel):
+    encoding: str
+    precision: int
+    coordinates: Union[str, List[int]]
+
+class encoded_gps_data(BaseModel):
+    gps_coordinates: encoded_gps
+    Density: List[float]
+
+class encoded_ride_data(BaseModel):
+    name: str
+    duration: float
+    date: str
+    time: str
+    distance: float
+    num_scenes: int
+    num_samples: int
+    gps_coordinates: encoded_gps
+
+class scene_summary(BaseModel):
+    scene: int
+    token: int
+    num_samples: int
+    num_gps_points: int
+    start: Optional[str]
+    end: Optional[str]
+    duration: float
+
+class scene_data(BaseModel):
+    ride: str
+    scene: int
+    token: int
+    num_samples: int
+    num_gps_points: int
+    start: Optional[str]
+    end: Optional[str]
+    duration: float
+    gps_coordinates: List[List[float]]
+
+class encoded_scene_data(BaseModel):
+    ride: str
+    scene: int
+    token: int
+    num_samples: int
+    num_gps_points: int
+    start: Optional[str]
+    end: Optional[str]
+    duration: float
+    gps_coordinates: encoded_gps
+
+class data_version(BaseModel):
+    version: str
+    loaded_at: str
+    last_refresh: Optional[str]
+    last_error: Optional[str]
+    num_directories: int
+    num_rides: int
@@ -0,0 +1,131 @@
+import hashlib
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Dict, Hashable, Optional
+
+from fastapi import Request, Response
+
+from compression import Compression, vary_with
+
+
+# Serialized response kept by the cache, etag is a strong ETag computed from the body.
+# The compressed bodies are added to encoded as the clients ask for them, so each encoding of a response
+# is computed once, their ETag is the one of the body with the encoding appended.
+class CachedResponse:
+    def __init__(self, body: bytes, media_type: Optional[str], headers: Dict[str, str]):
+        self.body = body
+        self.media_type = media_type
+        self.headers = headers
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        self.encoded: Dict[str, bytes] = {}
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.body) + sum(len(body) for body in self.encoded.values())
+
+    def encoded_etag(self, encoding: Optional[str]) -> str:
+        return self.etag if encoding is None else self.etag[:-1] + '-' + encoding + '"'
+
+
+# Opaque part of an ETag without the W/ prefix and the encoding suffix
+def etag_base(tag: str) -> str:
+    tag = tag[2:] if tag.startswith('W/') else tag
+    return tag.strip('"').partition('-')[0]
+
+
+# True if the If-None-Match header matches the ETag (weak comparison, as required for If-None-Match).
+# The encoding suffix of the tags is ignored: the encodings of a response only differ in the transfer,
+# the client already has the same body.
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag_base(etag) in [etag_base(tag) for tag in tags]
+
+
+# Least recently used cache of serialized responses bounded to max_bytes of bodies (0 disables it).
+# The entries belong to the current data version given by current_version(): the cache is emptied when
+# a response of a new version is added, and the responses built from a previous version are not added.
+# With a compression the responses are sent in the encoding negotiated with the client, the compressed bodies
+# are kept with the entries and count in max_bytes.
+class ResponseCache:
+    def __init__(self, max_bytes: int, current_version: Callable[[], str], compression: Optional[Compression] = None):
+        self.max_bytes = max_bytes
+        self.current_version = current_version
+        self.compression = compression
+        self.version: Optional[str] = None
+        self.entries = OrderedDict()
+        self.nbytes = 0
+        self.lock = Lock()
+
+    def get(self, version: str, key: Hashable) -> Optional[CachedResponse]:
+        with self.lock:
+            if version != self.version:
+                return None
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, version: str, key: Hashable, entry: CachedResponse) -> None:
+        if entry.nbytes > self.max_bytes:
+            return
+        with self.lock:
+            if version != self.current_version():
+                return
+            if version != self.version:
+                self.entries.clear()
+                self.nbytes = 0
+                self.version = version
+            if key in self.entries:
+                self.nbytes -= self.entries.pop(key).nbytes
+            self.entries[key] = entry
+            self.nbytes += entry.nbytes
+            self.evict()
+
+    # remove the least recently used entries until the cache fits in max_bytes, called with the lock held
+    def evict(self) -> None:
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    # Body of the entry compressed in the encoding, compressed on the first request and then read from the entry
+    def encoded_body(self, key: Hashable, entry: CachedResponse, encoding: str) -> bytes:
+        body = entry.encoded.get(encoding)
+        if body is not None:
+            return body
+        body = self.compression.compress(entry.body, encoding)
+        with self.lock:
+            if encoding not in entry.encoded:
+                entry.encoded[encoding] = body
+                if self.entries.get(key) is entry:
+                    self.nbytes += len(body)
+                    self.evict()
+        return body
+
+    # Response of the request built by build() or read from the cache, 304 if the client has the same ETag.
+    # The key is the path, the query parameters and the representation the response was built in (variant),
+    # streamed responses are not cached.
+    def respond(self, request: Request, version: str, variant: str, build: Callable[[], Response]) -> Response:
+        key = (request.url.path, tuple(sorted(request.query_params.multi_items())), variant)
+        entry = self.get(version, key)
+        if entry is None:
+            response = build()
+            if not hasattr(response, 'body'):
+                return response
+            headers = {name: value for name, value in response.headers.items() if name not in ('content-length', 'content-type')}
+            entry = CachedResponse(response.body, response.media_type, headers)
+            self.put(version, key, entry)
+        encoding = None
+        vary = 'Accept'
+        if self.compression is not None:
+            vary = vary_with(vary, 'Accept-Encoding')
+            if self.compression.compressible(entry.body):
+                encoding = self.compression.negotiate(request.headers.get('accept-encoding'))
+        headers = {**entry.headers, 'ETag': entry.encoded_etag(encoding), 'Vary': vary}
+        if etag_matches(request.headers.get('if-none-match'), entry.etag):
+            return Response(status_code=304, headers=headers)
+        if encoding is None:
+            return Response(entry.body, media_type=entry.media_type, headers=headers)
+        body = self.encoded_body(key, entry, encoding)
+        return Response(body, media_type=entry.media_type, headers={**headers, 'Content-Encoding': encoding})
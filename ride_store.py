@@ -0,0 +1,447 @@
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from functools import cached_property
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+# internal imports
+from helper_functions import DEFAULT_MEMORY_BUDGET, GPS_RANK, load_directories, load_directory, load_ride, map_directories, summarize_rides, valid_gps
+from snapshot_cache import SourceChangedError, source_key, load_summaries, save_summaries
+from spatial_index import GridIndex, circle_bboxes, owners
+
+# Columns kept for each level of the ride -> scene -> sample -> sensor hierarchy and their in-memory dtype.
+# Repeated strings are stored as categoricals (integer codes + one copy of each value).
+RIDE_DTYPES = {'token': 'int64', 'name': 'object', 'directory_token': 'int32', 'duration': 'float64',
+               'date': 'object', 'time': 'object', 'distance': 'float64', 'num_scenes': 'int32', 'num_samples': 'int32'}
+SCENE_DTYPES = {'token': 'int64', 'ride_token': 'int64', 'dir_name': 'category'}
+SAMPLE_DTYPES = {'token': 'int64', 'scene_token': 'int64', 'timestamp': 'datetime64[ns]', 'prev_sample_token': 'float64'}
+SENSOR_DTYPES = {'token': 'int32', 'timestamp': 'datetime64[ns]', 'sample_token': 'int32', 'scene_token': 'int32',
+                 'measurement_type': 'category', 'calibrated_sensor_name': 'category', 'sensor_data_type': 'category',
+                 'lat': 'float64', 'lon': 'float64', 'hgt': 'float64',
+                 'lat_std': 'float32', 'lon_std': 'float32', 'hgt_std': 'float32', GPS_RANK: 'float64'}
+
+# Fields of a ride returned by the overview endpoints
+SUMMARY_FIELDS = ['token', 'name', 'directory_token', 'duration', 'date', 'time', 'distance', 'num_scenes', 'num_samples']
+
+
+# Convert a list of records to one contiguous array per column
+def to_columns(records: List[Dict], dtypes: Dict[str, str]) -> Dict[str, np.ndarray]:
+    df = pd.DataFrame.from_records(records, columns=list(dtypes)).astype(dtypes)
+    return {column: df[column].array if dtype == 'category' else df[column].to_numpy() for column, dtype in dtypes.items()}
+
+
+# Offsets of the children of each parent from the number of children of each parent
+def to_offsets(counts: List[int]) -> np.ndarray:
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+# Convert a frame to one contiguous array per column
+def frame_columns(df: pd.DataFrame, dtypes: Dict[str, str]) -> Dict[str, np.ndarray]:
+    df = df[list(dtypes)].astype(dtypes)
+    return {column: df[column].array if dtype == 'category' else df[column].to_numpy() for column, dtype in dtypes.items()}
+
+
+# Summary records (SUMMARY_FIELDS) of the rides of a directory linked by helper_functions.link_directory
+def summary_records(linked: Tuple, directory_token: int) -> List[Dict]:
+    summaries = summarize_rides(*linked)
+    summaries.insert(0, 'token', linked[0]['token'].to_numpy())
+    summaries.insert(1, 'name', linked[0]['name'].to_numpy())
+    summaries.insert(2, 'directory_token', directory_token)
+    return summaries.to_dict(orient='records')
+
+
+# Aggregates of the ride summaries shown by the overview: totals, averages per ride and number of rides
+# per day (YYYY-MM-DD) and per ISO week (YYYY-Www), the rides without a date are only counted in the totals
+def ride_aggregates(rides: Dict[str, np.ndarray]) -> Dict:
+    num_rides = len(rides['token'])
+    totals = {'num_rides': num_rides,
+              'num_scenes': int(rides['num_scenes'].sum()),
+              'num_samples': int(rides['num_samples'].sum()),
+              'total_duration': float(rides['duration'].sum()),
+              'total_distance': float(rides['distance'].sum()),
+              }
+    averages = {f'avg_{name}': totals[field] / num_rides if num_rides else 0.0
+                for name, field in [('scenes', 'num_scenes'), ('samples', 'num_samples'),
+                                    ('duration', 'total_duration'), ('distance', 'total_distance')]}
+    dates = pd.to_datetime(pd.Series(rides['date'][rides['date'] != ''], dtype=object), format='%Y-%m-%d')
+    iso = dates.dt.isocalendar()
+    periods = {'rides_per_day': dates.dt.strftime('%Y-%m-%d'),
+               'rides_per_week': iso['year'].astype(str) + '-W' + iso['week'].astype(str).str.zfill(2)}
+    counts = {name: [{'period': period, 'rides': int(count)} for period, count in values.value_counts().sort_index().items()]
+              for name, values in periods.items()}
+    return {**totals, **averages, **counts}
+
+
+# Summary columns of the rides, shared by the eager and the lazy store.
+# The summary records, their aggregates and the name -> ride index are built once when the rides are loaded,
+# they are shared by the requests and must not be modified.
+class RideIndex:
+    def __init__(self, rides: Dict[str, np.ndarray]):
+        self.rides = rides
+        columns = [rides[field].tolist() for field in SUMMARY_FIELDS]
+        self.summaries = [dict(zip(SUMMARY_FIELDS, values)) for values in zip(*columns)]
+        self.aggregates = ride_aggregates(rides)
+        # the first ride wins if a name is loaded twice
+        self.name_index = {}
+        for i, name in enumerate(rides['name'].tolist()):
+            self.name_index.setdefault(name, i)
+
+    def __len__(self) -> int:
+        return len(self.rides['token'])
+
+    # Index of the ride with the given name, None if it is not loaded
+    def find_ride(self, ride_name: str) -> Optional[int]:
+        return self.name_index.get(ride_name)
+
+    # Summaries of the rides (all of them, or the ones at the given indices)
+    def ride_summaries(self, indices: Optional[List[int]] = None) -> List[Dict]:
+        return self.summaries if indices is None else [self.summaries[i] for i in indices]
+
+
+# Columnar in-memory store of the rides.
+# Each level is a dict of column arrays, the children of the i-th element of a level are the
+# elements [offsets[i], offsets[i+1]) of the next level, so a ride is a contiguous slice of every level.
+# The valid GPS measurements are copied once into the gps arrays (lat, lon, hgt and their simplification rank) in
+# sensor order, with the range of each ride, scene and sample in ride_gps_offsets, scene_gps_offsets and
+# sample_gps_offsets, and indexed by location in gps_index.
+class RideStore(RideIndex):
+    def __init__(self, rides: Dict[str, np.ndarray], scenes: Dict[str, np.ndarray], samples: Dict[str, np.ndarray],
+                 sensors: Dict[str, np.ndarray], scene_offsets: np.ndarray, sample_offsets: np.ndarray,
+                 sensor_offsets: np.ndarray):
+        super().__init__(rides)
+        self.scenes = scenes
+        self.samples = samples
+        self.sensors = sensors
+        self.scene_offsets = scene_offsets
+        self.sample_offsets = sample_offsets
+        self.sensor_offsets = sensor_offsets
+        # GPS
+        valid = valid_gps(sensors['lat'], sensors['lon'], sensors['hgt'])
+        self.gps = {column: sensors[column][valid] for column in ['lat', 'lon', 'hgt']}
+        self.gps['rank'] = sensors[GPS_RANK][valid]
+        # number of valid measurements before each sensor
+        valid_before = np.zeros(len(valid) + 1, dtype=np.int64)
+        np.cumsum(valid, out=valid_before[1:])
+        self.sample_gps_offsets = valid_before[sensor_offsets]
+        self.scene_gps_offsets = self.sample_gps_offsets[sample_offsets]
+        self.ride_gps_offsets = self.scene_gps_offsets[scene_offsets]
+        self.gps_index = GridIndex(self.gps['lat'], self.gps['lon'])
+
+    # Build the store from the linked frames returned by helper_functions.load_directory, one tuple per directory
+    # (the directory token is the position in the list).
+    # The ride summaries are computed on the arrays unless they are given, in store order.
+    @classmethod
+    def from_frames(cls, directories: List[Tuple], summaries: Optional[List[Dict]] = None) -> 'RideStore':
+        levels = {'scenes': [], 'samples': [], 'sensors': []}
+        counts = {'scenes': [], 'samples': [], 'sensors': []}
+        computed_summaries = []
+        for i, linked in enumerate(directories):
+            _, scenes, samples, sensors, scene_counts, sample_counts, sensor_counts = linked
+            if summaries is None:
+                computed_summaries.extend(summary_records(linked, i))
+            for name, level, level_counts in [('scenes', scenes, scene_counts), ('samples', samples, sample_counts), ('sensors', sensors, sensor_counts)]:
+                levels[name].append(level)
+                counts[name].append(level_counts)
+        return cls(
+            rides=to_columns(computed_summaries if summaries is None else summaries, RIDE_DTYPES),
+            scenes=frame_columns(pd.concat(levels['scenes'], ignore_index=True), SCENE_DTYPES),
+            samples=frame_columns(pd.concat(levels['samples'], ignore_index=True), SAMPLE_DTYPES),
+            sensors=frame_columns(pd.concat(levels['sensors'], ignore_index=True), SENSOR_DTYPES),
+            scene_offsets=to_offsets(np.concatenate(counts['scenes'])),
+            sample_offsets=to_offsets(np.concatenate(counts['samples'])),
+            sensor_offsets=to_offsets(np.concatenate(counts['sensors'])),
+        )
+
+    # Approximate memory used by the arrays of the store
+    @property
+    def nbytes(self) -> int:
+        levels = [self.rides, self.scenes, self.samples, self.sensors, self.gps]
+        offsets = [self.scene_offsets, self.sample_offsets, self.sensor_offsets,
+                   self.ride_gps_offsets, self.scene_gps_offsets, self.sample_gps_offsets]
+        return (sum(column.nbytes for level in levels for column in level.values()) + sum(o.nbytes for o in offsets)
+                + self.gps_index.nbytes)
+
+    # Range of the GPS measurements of a ride, or of all rides
+    def gps_range(self, ride: Optional[int] = None) -> Tuple[int, int]:
+        if ride is None:
+            return 0, len(self.gps['lat'])
+        return int(self.ride_gps_offsets[ride]), int(self.ride_gps_offsets[ride + 1])
+
+    # Latitude, longitude and height of the valid GPS measurements of a ride (or of all rides) in sensor order
+    def gps_points(self, ride: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        start, end = self.gps_range(ride)
+        return self.gps['lat'][start:end], self.gps['lon'][start:end], self.gps['hgt'][start:end]
+
+    # Latitude, longitude and Visvalingam-Whyatt rank (see track_simplify) of the GPS track of a ride
+    def gps_track(self, ride: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        start, end = self.gps_range(ride)
+        return self.gps['lat'][start:end], self.gps['lon'][start:end], self.gps['rank'][start:end]
+
+    # Index of the scene at the given position (from 0) in a ride, None if the ride has fewer scenes
+    def find_scene(self, ride: int, scene: int) -> Optional[int]:
+        start, end = int(self.scene_offsets[ride]), int(self.scene_offsets[ride + 1])
+        return start + scene if 0 <= scene < end - start else None
+
+    # Summaries of the scenes of a ride in order: position in the ride, token, number of samples and GPS measurements,
+    # and time span of the samples (start and end as ISO strings, None for a scene without timestamps, duration in s)
+    def scene_summaries(self, ride: int) -> List[Dict]:
+        start, end = int(self.scene_offsets[ride]), int(self.scene_offsets[ride + 1])
+        sample_offsets = self.sample_offsets[start:end + 1]
+        num_samples = np.diff(sample_offsets)
+        num_gps = np.diff(self.scene_gps_offsets[start:end + 1])
+        timestamps = self.samples['timestamp'][sample_offsets[0]:sample_offsets[-1]]
+        # the missing timestamps (NaT) are ignored
+        known = ~np.isnat(timestamps)
+        values = timestamps.view(np.int64)
+        has_samples = num_samples > 0
+        has_time = np.zeros(end - start, dtype=bool)
+        first, last = np.zeros(end - start, dtype=np.int64), np.zeros(end - start, dtype=np.int64)
+        if has_samples.any():
+            # the empty scenes are skipped, reduceat needs the start of non empty segments
+            segments = (sample_offsets[:-1] - sample_offsets[0])[has_samples]
+            has_time[has_samples] = np.add.reduceat(known, segments) > 0
+            first[has_samples] = np.minimum.reduceat(np.where(known, values, np.iinfo(np.int64).max), segments)
+            last[has_samples] = np.maximum.reduceat(np.where(known, values, np.iinfo(np.int64).min), segments)
+        summaries = []
+        for i in range(end - start):
+            span = {'start': None, 'end': None, 'duration': 0.0}
+            if has_time[i]:
+                span = {'start': pd.Timestamp(first[i]).isoformat(), 'end': pd.Timestamp(last[i]).isoformat(),
+                        'duration': float(last[i] - first[i]) / 1e9}
+            summaries.append({'scene': i, 'token': int(self.scenes['token'][start + i]), 'num_samples': int(num_samples[i]),
+                              'num_gps_points': int(num_gps[i]), **span})
+        return summaries
+
+    # Same as gps_track for a scene of a ride (its slice of the ride track, ranked with the whole ride)
+    def scene_track(self, ride: int, scene: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        index = self.find_scene(ride, scene)
+        start, end = int(self.scene_gps_offsets[index]), int(self.scene_gps_offsets[index + 1])
+        return self.gps['lat'][start:end], self.gps['lon'][start:end], self.gps['rank'][start:end]
+
+    # Valid GPS measurements in a bounding box (min_lat, min_lon, max_lat, max_lon) or within a circle (lat, lon, radius in km),
+    # returns the ride index, sample token, latitude and longitude of each measurement in sensor order
+    def gps_in_area(self, bbox: Optional[Tuple[float, float, float, float]] = None,
+                    circle: Optional[Tuple[float, float, float]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        positions = self.gps_index.query_bbox(*bbox) if bbox is not None else self.gps_index.query_radius(*circle)
+        rides = owners(self.ride_gps_offsets, positions)
+        samples = owners(self.sample_gps_offsets, positions)
+        return rides, self.samples['token'][samples], self.gps['lat'][positions], self.gps['lon'][positions]
+
+
+# Store of each directory (see helper_functions.load_directories), the directory token of their rides is 0
+def load_directory_stores(dir_paths: list, cache: bool = True, workers: int = 1,
+                          memory_budget: int = DEFAULT_MEMORY_BUDGET) -> List[RideStore]:
+    return [RideStore.from_frames([linked]) for linked in load_directories(dir_paths, cache, workers, memory_budget)]
+
+
+# Rides of several directories kept in one store per directory (see load_directory_stores), so a new version of the data
+# reuses the stores of the directories that did not change. The rides are numbered across the directories in the order
+# of the stores (the directory token is the position of the store) and answered by the store of their directory.
+class CombinedRideStore(RideIndex):
+    def __init__(self, stores: List[RideStore]):
+        super().__init__(to_columns([dict(summary, directory_token=i) for i, store in enumerate(stores)
+                                     for summary in store.summaries], RIDE_DTYPES))
+        self.stores = stores
+        # the rides of the i-th store are [ride_offsets[i], ride_offsets[i+1])
+        self.ride_offsets = to_offsets([len(store) for store in stores])
+
+    # Store of the directory of a ride and index of the ride in it
+    def locate(self, ride: int) -> Tuple[RideStore, int]:
+        directory = int(self.rides['directory_token'][ride])
+        return self.stores[directory], ride - int(self.ride_offsets[directory])
+
+    # GPS measurements of all the rides, concatenated on the first call
+    @cached_property
+    def all_gps_points(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        points = [store.gps_points() for store in self.stores]
+        return tuple(np.concatenate([np.empty(0)] + [p[axis] for p in points]) for axis in range(3))
+
+    # Same as RideStore.gps_points
+    def gps_points(self, ride: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if ride is None:
+            return self.all_gps_points
+        store, index = self.locate(ride)
+        return store.gps_points(index)
+
+    # Same as RideStore.gps_track
+    def gps_track(self, ride: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        store, index = self.locate(ride)
+        return store.gps_track(index)
+
+    # Same as RideStore.find_scene
+    def find_scene(self, ride: int, scene: int) -> Optional[int]:
+        store, index = self.locate(ride)
+        return store.find_scene(index, scene)
+
+    # Same as RideStore.scene_summaries
+    def scene_summaries(self, ride: int) -> List[Dict]:
+        store, index = self.locate(ride)
+        return store.scene_summaries(index)
+
+    # Same as RideStore.scene_track
+    def scene_track(self, ride: int, scene: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        store, index = self.locate(ride)
+        return store.scene_track(index, scene)
+
+    # Same as RideStore.gps_in_area, each directory is queried with its own index
+    def gps_in_area(self, bbox: Optional[Tuple[float, float, float, float]] = None,
+                    circle: Optional[Tuple[float, float, float]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        results = [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))]
+        for store, offset in zip(self.stores, self.ride_offsets.tolist()):
+            rides, sample_tokens, lat, lon = store.gps_in_area(bbox, circle)
+            results.append((rides + offset, sample_tokens, lat, lon))
+        return tuple(np.concatenate([r[axis] for r in results]) for axis in range(4))
+
+
+# Smallest resolution of bin_points in degrees (cells of about 0.1 m), far enough from the resolutions whose cell
+# indices overflow an int64
+MIN_RESOLUTION = 1e-6
+
+
+# Count the points in the cells of a grid of resolution degrees aligned on multiples of resolution.
+# Only the points in the bounding box (open on the sides left to None) are counted.
+# Returns the latitude and longitude of the center of the non empty cells and their number of points.
+def bin_points(lat: np.ndarray, lon: np.ndarray, resolution: float, min_lat: Optional[float] = None,
+               min_lon: Optional[float] = None, max_lat: Optional[float] = None,
+               max_lon: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if resolution < MIN_RESOLUTION:
+        raise ValueError(f'resolution must be at least {MIN_RESOLUTION} degrees')
+    inside = np.ones(len(lat), dtype=bool)
+    for values, bound, keep in [(lat, min_lat, np.greater_equal), (lon, min_lon, np.greater_equal),
+                                (lat, max_lat, np.less_equal), (lon, max_lon, np.less_equal)]:
+        if bound is not None:
+            inside &= keep(values, bound)
+    cells = np.floor(np.column_stack((lat[inside], lon[inside])) / resolution).astype(np.int64)
+    cells, counts = np.unique(cells, axis=0, return_counts=True)
+    centers = (cells + 0.5) * resolution
+    return centers[:, 0], centers[:, 1], counts
+
+
+# Bounding box [min_lat, min_lon, max_lat, max_lon] of the valid GPS measurements of each ride of a linked directory,
+# None for the rides without any
+def gps_bounds(linked: Tuple) -> List[Optional[List[float]]]:
+    rides, _, _, sensors, scene_counts, sample_counts, sensor_counts = linked
+    ride_of_sensor = np.repeat(np.repeat(np.repeat(np.arange(len(rides)), scene_counts), sample_counts), sensor_counts)
+    lat, lon = sensors['lat'].to_numpy(dtype=np.float64), sensors['lon'].to_numpy(dtype=np.float64)
+    valid = valid_gps(lat, lon, sensors['hgt'].to_numpy(dtype=np.float64))
+    bounds = np.column_stack([np.full(len(rides), np.inf)] * 2 + [np.full(len(rides), -np.inf)] * 2)
+    for column, values, reduce in [(0, lat, np.minimum), (1, lon, np.minimum), (2, lat, np.maximum), (3, lon, np.maximum)]:
+        reduce.at(bounds[:, column], ride_of_sensor[valid], values[valid])
+    return [ride_bounds if np.isfinite(ride_bounds[0]) else None for ride_bounds in bounds.tolist()]
+
+
+# Summaries of the rides of a directory with the bounding box of their GPS measurements (gps_bounds) and the source key
+# of the csv files they were computed for, read from its summaries file while the csv files did not change
+def directory_summaries(path: str, cache: bool = True, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> Tuple[Dict, List[Dict]]:
+    key = source_key(path)
+    summaries = load_summaries(path, key) if cache else None
+    if summaries is None:
+        linked = load_directory(path, cache, memory_budget)
+        summaries = summary_records(linked, 0)
+        for summary, bounds in zip(summaries, gps_bounds(linked)):
+            summary['gps_bounds'] = bounds
+        if cache:
+            save_summaries(path, key, summaries)
+    return key, summaries
+
+
+# Source key and summaries of the rides of each directory (see directory_summaries and helper_functions.map_directories)
+def load_directory_summaries(dir_paths: list, cache: bool = True, workers: int = 1,
+                             memory_budget: int = DEFAULT_MEMORY_BUDGET) -> List[Tuple[Dict, List[Dict]]]:
+    return map_directories(directory_summaries, dir_paths, workers, cache, memory_budget)
+
+
+# Store that only keeps the ride summaries in memory, built from the source key and the summaries of the rides of each
+# directory (see load_directory_summaries).
+# The scenes, samples and sensors of a ride are read from the snapshot of its directory (only the rows of the ride)
+# the first time they are needed and kept in a least recently used cache bounded to max_bytes.
+# A ride is only read while the csv files of its directory keep the source key of its summary, otherwise hydrate
+# raises SourceChangedError until the store is built again from the new summaries.
+class LazyRideStore(RideIndex):
+    def __init__(self, dir_paths: list, directories: List[Tuple[Dict, List[Dict]]], cache: bool = True,
+                 max_bytes: int = 256 * 2**20, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        summaries, positions = [], []
+        for i, (_, dir_summaries) in enumerate(directories):
+            summaries.extend(dict(summary, directory_token=i) for summary in dir_summaries)
+            # position of the ride among the rides with scenes of its directory
+            positions.extend(range(len(dir_summaries)))
+        super().__init__(to_columns(summaries, RIDE_DTYPES))
+        self.dir_paths = dir_paths
+        self.keys = [key for key, _ in directories]
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self.memory_budget = memory_budget
+        self.positions = np.array(positions, dtype=np.int64)
+        # bounding box of the GPS measurements of each ride, NaN for the rides without any
+        self.gps_bounds = np.array([summary['gps_bounds'] or [np.nan] * 4 for summary in summaries], dtype=np.float64).reshape(-1, 4)
+        self.hydrated = OrderedDict()
+        self.hydrated_bytes = 0
+        self.lock = Lock()
+
+    # Single ride store of the given ride, read from its directory if it is not cached
+    def hydrate(self, ride: int) -> RideStore:
+        with self.lock:
+            if ride in self.hydrated:
+                self.hydrated.move_to_end(ride)
+                return self.hydrated[ride]
+        directory = int(self.rides['directory_token'][ride])
+        linked = load_ride(self.dir_paths[directory], int(self.positions[ride]), self.keys[directory], self.cache, self.memory_budget)
+        # the csv files may change between the check of their key and their parsing
+        summary = self.summaries[ride]
+        if (linked[0]['token'].tolist() != [summary['token']] or len(linked[1]) != summary['num_scenes']
+                or len(linked[2]) != summary['num_samples']):
+            raise SourceChangedError(self.dir_paths[directory])
+        ride_store = RideStore.from_frames([linked], self.ride_summaries([ride]))
+        with self.lock:
+            # another request may have read the same ride meanwhile
+            if ride in self.hydrated:
+                return self.hydrated[ride]
+            self.hydrated[ride] = ride_store
+            self.hydrated_bytes += ride_store.nbytes
+            # evict the least recently used rides, always keeping the one just read
+            while self.hydrated_bytes > self.max_bytes and len(self.hydrated) > 1:
+                _, evicted = self.hydrated.popitem(last=False)
+                self.hydrated_bytes -= evicted.nbytes
+        return ride_store
+
+    # Same as RideStore.gps_points, all rides are read one after the other
+    def gps_points(self, ride: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if ride is not None:
+            return self.hydrate(ride).gps_points(0)
+        points = [self.hydrate(i).gps_points(0) for i in range(len(self))]
+        return tuple(np.concatenate([p[axis] for p in points]) for axis in range(3))
+
+    # Same as RideStore.gps_track
+    def gps_track(self, ride: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.hydrate(ride).gps_track(0)
+
+    # Same as RideStore.find_scene, the number of scenes is read from the summary without reading the ride
+    def find_scene(self, ride: int, scene: int) -> Optional[int]:
+        return scene if 0 <= scene < self.summaries[ride]['num_scenes'] else None
+
+    # Same as RideStore.scene_summaries
+    def scene_summaries(self, ride: int) -> List[Dict]:
+        return self.hydrate(ride).scene_summaries(0)
+
+    # Same as RideStore.scene_track
+    def scene_track(self, ride: int, scene: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        return self.hydrate(ride).scene_track(0, scene)
+
+    # Same as RideStore.gps_in_area, only the rides whose GPS bounding box intersects the area (or the bounding boxes
+    # of the circle) are read, one after the other, and queried with their own index
+    def gps_in_area(self, bbox: Optional[Tuple[float, float, float, float]] = None,
+                    circle: Optional[Tuple[float, float, float]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        intersects = np.zeros(len(self), dtype=bool)
+        for min_lat, min_lon, max_lat, max_lon in [bbox] if bbox is not None else circle_bboxes(*circle):
+            # the comparisons with NaN are False, so the rides without GPS measurements are skipped
+            intersects |= ((self.gps_bounds[:, 0] <= max_lat) & (self.gps_bounds[:, 2] >= min_lat)
+                           & (self.gps_bounds[:, 1] <= max_lon) & (self.gps_bounds[:, 3] >= min_lon))
+        # no measurement when no ride intersects the area
+        results = [(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0), np.empty(0))]
+        for i in np.flatnonzero(intersects).tolist():
+            rides, sample_tokens, lat, lon = self.hydrate(i).gps_in_area(bbox, circle)
+            results.append((rides + i, sample_tokens, lat, lon))
+        return tuple(np.concatenate([r[axis] for r in results]) for axis in range(4))
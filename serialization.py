@@ -0,0 +1,84 @@
+import json
+import numpy as np
+from fastapi import Response
+from typing import Dict, Iterator, Optional
+
+# orjson is optional, it serializes the large responses several times faster than the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyarrow and msgpack are optional, the binary formats are only served when they are installed
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = 'application/json'
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+
+# Serialize plain python values (dicts, lists, str, int, float, None) to JSON
+def dump_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(',', ':')).encode()
+
+
+# JSON response of content already matching the response model of the endpoint.
+# FastAPI neither validates nor converts a returned Response, so declare the model with response_model
+# in the route decorator to keep it in the OpenAPI schema.
+def json_response(content, headers: Optional[dict] = None) -> Response:
+    return Response(dump_json(content), media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+# One JSON document per line for each record, chunk_size records at a time
+def ndjson_lines(records: Iterator, chunk_size: int) -> Iterator[bytes]:
+    chunk = []
+    for record in records:
+        chunk.append(dump_json(record))
+        if len(chunk) == chunk_size:
+            yield b'\n'.join(chunk) + b'\n'
+            chunk = []
+    if chunk:
+        yield b'\n'.join(chunk) + b'\n'
+
+
+# Binary media type requested by the Accept header that can be served, None to answer in JSON.
+# Arrow is preferred when both are accepted, the quality values are not taken into account.
+def binary_media_type(accept: str) -> Optional[str]:
+    if pa is not None and ARROW_MEDIA_TYPE in accept:
+        return ARROW_MEDIA_TYPE
+    if msgpack is not None and MSGPACK_MEDIA_TYPE in accept:
+        return MSGPACK_MEDIA_TYPE
+    return None
+
+
+# Arrow IPC stream of a single record batch, numeric columns are wrapped without conversion
+def arrow_bytes(columns: Dict[str, np.ndarray]) -> bytes:
+    table = pa.table({name: pa.array(values) for name, values in columns.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+# MessagePack map of the columns: a numeric column is its raw buffer with its numpy dtype
+# ({'dtype': '<f8', 'data': bytes}), the other columns are lists
+def msgpack_bytes(columns: Dict[str, np.ndarray]) -> bytes:
+    return msgpack.packb({name: {'dtype': values.dtype.str, 'data': np.ascontiguousarray(values).tobytes()}
+                          if values.dtype.kind in 'biuf' else values.tolist()
+                          for name, values in columns.items()})
+
+
+# Response with the columns (of equal length) in the given binary media type
+def columnar_response(columns: Dict[str, np.ndarray], media_type: str, headers: Optional[dict] = None) -> Response:
+    content = arrow_bytes(columns) if media_type == ARROW_MEDIA_TYPE else msgpack_bytes(columns)
+    return Response(content, media_type=media_type, headers=headers)
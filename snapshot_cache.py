@@ -0,0 +1,211 @@
+import json
+import os
+import struct
+import zipfile
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# Binary snapshot of the parsed, merged and linked csv files of a data directory (see helper_functions.link_directory).
+# The snapshot is written next to the csv files and is only used while the csv files keep the size and
+# modification time they had when it was written, otherwise the directory is parsed again.
+# The arrays are stored uncompressed, so the rows of a single ride can be read from a memory map of the file.
+
+SNAPSHOT_FILE = '.snapshot.npz'
+# summaries of the rides of the directory, used by the lazy store
+SUMMARIES_FILE = '.summaries.json'
+# bump when the content of the snapshot or of the summaries changes so old snapshots and summaries are rebuilt
+SNAPSHOT_VERSION = 7
+SOURCE_FILES = ['rides.csv', 'scenes.csv', 'samples.csv', 'sensor_data.csv', 'gps_data.csv']
+# frames of a linked directory, in the order returned by helper_functions.link_directory
+FRAME_NAMES = ['rides', 'scenes', 'samples', 'sensors']
+# offsets of the children of each ride, scene and sample, the i-th row owns the rows [offsets[i], offsets[i+1])
+# of the next level
+OFFSET_NAMES = ['scene_offsets', 'sample_offsets', 'sensor_offsets']
+
+
+# The csv files of a directory changed since the data read from it was indexed: the rows of a ride are no longer at
+# the position they were indexed at, the data must be loaded again
+class SourceChangedError(Exception):
+    pass
+
+
+# Size and modification time of the source csv files of a directory
+def source_key(path: str) -> Dict:
+    key = {'version': SNAPSHOT_VERSION}
+    for file_name in SOURCE_FILES:
+        stat = os.stat(os.path.join(path, file_name))
+        key[file_name] = [stat.st_size, stat.st_mtime_ns]
+    return key
+
+
+# Store every column as a plain array so the snapshot can be loaded without pickle
+def frame_to_arrays(name: str, df: pd.DataFrame, arrays: Dict[str, np.ndarray]) -> List:
+    columns = []
+    for column in df.columns:
+        values = df[column]
+        prefix = f'{name}/{column}'
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[f'{prefix}/codes'] = values.cat.codes.to_numpy()
+            arrays[f'{prefix}/categories'] = values.cat.categories.to_numpy().astype(str)
+            columns.append([column, 'category'])
+        elif values.dtype == 'datetime64[ns]':
+            # nanoseconds since the epoch, NaT is the smallest int64
+            arrays[f'{prefix}/values'] = values.to_numpy().view(np.int64)
+            columns.append([column, 'datetime'])
+        elif values.dtype == object:
+            null = values.isna().to_numpy()
+            arrays[f'{prefix}/values'] = values.where(~null, '').to_numpy().astype(str)
+            arrays[f'{prefix}/null'] = null
+            columns.append([column, 'object'])
+        else:
+            arrays[f'{prefix}/values'] = values.to_numpy()
+            columns.append([column, 'numeric'])
+    return columns
+
+
+# Copy of an array out of its memory map (see map_arrays) so the frames do not keep the file mapped,
+# the arrays already in memory are returned as they are
+def read(values: np.ndarray) -> np.ndarray:
+    return np.array(values) if isinstance(values, np.memmap) else values
+
+
+# Frame of the arrays stored by frame_to_arrays, only the given rows of it if they are given
+def arrays_to_frame(name: str, columns: List, arrays, rows: slice = slice(None)) -> pd.DataFrame:
+    data = {}
+    for column, kind in columns:
+        prefix = f'{name}/{column}'
+        if kind == 'category':
+            data[column] = pd.Categorical.from_codes(read(arrays[f'{prefix}/codes'][rows]), categories=read(arrays[f'{prefix}/categories']))
+        elif kind == 'datetime':
+            data[column] = read(arrays[f'{prefix}/values'][rows]).view('datetime64[ns]')
+        elif kind == 'object':
+            values = arrays[f'{prefix}/values'][rows].astype(object)
+            values[read(arrays[f'{prefix}/null'][rows])] = np.nan
+            data[column] = values
+        else:
+            data[column] = read(arrays[f'{prefix}/values'][rows])
+    return pd.DataFrame(data, columns=[column for column, _ in columns])
+
+
+# Rows of a ride of a linked directory in each level: the ride (its position among the rides), its scenes, samples
+# and sensors, from the offsets of the children of each ride, scene and sample.
+# Returns the (start, end) rows of each level and the number of children of the rows of the ride in the levels above the sensors.
+def ride_rows(offsets: List[np.ndarray], position: int) -> Tuple[List[Tuple[int, int]], List[np.ndarray]]:
+    rows, counts = [(position, position + 1)], []
+    for level_offsets in offsets:
+        start, end = rows[-1]
+        level = np.array(level_offsets[start:end + 1], dtype=np.int64)
+        counts.append(np.diff(level))
+        rows.append((int(level[0]), int(level[-1])))
+    return rows, counts
+
+
+# Linked directory of the frames and offsets of a snapshot (the rows of a single ride if position is given)
+def snapshot_to_linked(meta: Dict, arrays, position: Optional[int] = None) -> Tuple:
+    offsets = [arrays[name] for name in OFFSET_NAMES]
+    if position is None:
+        rows = [slice(None)] * len(FRAME_NAMES)
+        counts = [np.diff(level_offsets) for level_offsets in offsets]
+    else:
+        ride_slices, counts = ride_rows(offsets, position)
+        rows = [slice(start, end) for start, end in ride_slices]
+    frames = [arrays_to_frame(name, meta['columns'][name], arrays, level_rows) for name, level_rows in zip(FRAME_NAMES, rows)]
+    return (*frames, *counts)
+
+
+# Read-only views of the arrays of an uncompressed .npz file on a memory map of the file, nothing is read until
+# the views are used
+def map_arrays(path: str) -> Dict[str, np.ndarray]:
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    arrays = {}
+    with open(path, 'rb') as f, zipfile.ZipFile(f) as archive:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f'{info.filename} is compressed')
+            # the local header of the entry (30 bytes, then the file name and the extra field) precedes the .npy file
+            name_length, extra_length = struct.unpack('<HH', buffer[info.header_offset + 26:info.header_offset + 30].tobytes())
+            f.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(f)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+            shape, fortran_order, dtype = read_header(f)
+            start = f.tell()
+            end = start + int(np.prod(shape)) * dtype.itemsize
+            arrays[info.filename[:-len('.npy')]] = buffer[start:end].view(dtype).reshape(shape, order='F' if fortran_order else 'C')
+    return arrays
+
+
+# Load the linked frames of a directory from its snapshot, None if there is no snapshot or it is out of date
+def load_snapshot(path: str, key: Dict) -> Optional[Tuple]:
+    snapshot_path = os.path.join(path, SNAPSHOT_FILE)
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with np.load(snapshot_path, allow_pickle=False) as arrays:
+            meta = json.loads(str(arrays['__meta__']))
+            if meta['key'] != key:
+                return None
+            return snapshot_to_linked(meta, arrays)
+    except (OSError, ValueError, KeyError):
+        # unreadable snapshot, parse the csv files again
+        return None
+
+
+# Load the linked frames of a single ride of a directory (its position among the rides of the snapshot), only its rows
+# are read from the snapshot. None if there is no snapshot or it is out of date.
+def load_snapshot_ride(path: str, key: Dict, position: int) -> Optional[Tuple]:
+    snapshot_path = os.path.join(path, SNAPSHOT_FILE)
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        arrays = map_arrays(snapshot_path)
+        meta = json.loads(str(arrays['__meta__']))
+        if meta['key'] != key:
+            return None
+        return snapshot_to_linked(meta, arrays, position)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return None
+
+
+# Load the ride summaries of a directory, None if they are missing or out of date
+def load_summaries(path: str, key: Dict) -> Optional[List[Dict]]:
+    try:
+        with open(os.path.join(path, SUMMARIES_FILE)) as f:
+            content = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return content['summaries'] if content.get('key') == key else None
+
+
+# Write the ride summaries of a directory, skipped if the directory is not writable
+def save_summaries(path: str, key: Dict, summaries: List[Dict]) -> None:
+    summaries_path = os.path.join(path, SUMMARIES_FILE)
+    tmp_path = f'{summaries_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': key, 'summaries': summaries}, f)
+        os.replace(tmp_path, summaries_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# Write the linked frames of a directory to its snapshot, skipped if the directory is not writable.
+# The key must be taken before reading the csv files so a file modified while parsing invalidates the snapshot.
+def save_snapshot(path: str, key: Dict, linked: Tuple) -> None:
+    arrays = {}
+    columns = {name: frame_to_arrays(name, df, arrays) for name, df in zip(FRAME_NAMES, linked[:4])}
+    for name, counts in zip(OFFSET_NAMES, linked[4:]):
+        arrays[name] = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    arrays['__meta__'] = np.array(json.dumps({'key': key, 'columns': columns}))
+    snapshot_path = os.path.join(path, SNAPSHOT_FILE)
+    tmp_path = f'{snapshot_path}.{os.getpid()}.tmp'
+    try:
+        # write to a temporary file first so a reader never sees a partial snapshot,
+        # uncompressed (np.savez) so the arrays can be memory mapped
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
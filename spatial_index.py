@@ -0,0 +1,84 @@
+import numpy as np
+from typing import List, Tuple
+
+# internal imports
+from helper_functions import haversine
+
+# mean earth radius in km, the one used by helper_functions.haversine
+EARTH_RADIUS = 6371
+# cells of about 1km, a query reads the cells overlapping the area then filters the points of these cells
+DEFAULT_CELL_SIZE = 0.01
+
+
+# Grid index over points given by their latitude and longitude in degrees.
+# The points are sorted by cell (row major on a grid of cell_size degrees), the points of the cells of a row
+# of the grid overlapping an area are then a contiguous slice found by binary search,
+# so a query reads O(rows * log(n)) keys plus the points of the overlapped cells instead of every point.
+class GridIndex:
+    def __init__(self, lat: np.ndarray, lon: np.ndarray, cell_size: float = DEFAULT_CELL_SIZE):
+        self.lat = lat
+        self.lon = lon
+        self.cell_size = cell_size
+        rows, cols = self.cells(lat, lon)
+        if len(lat):
+            self.min_row, self.max_row = int(rows.min()), int(rows.max())
+            self.min_col, self.max_col = int(cols.min()), int(cols.max())
+        else:
+            self.min_row, self.max_row, self.min_col, self.max_col = 0, -1, 0, -1
+        self.num_cols = self.max_col - self.min_col + 1
+        keys = (rows - self.min_row) * self.num_cols + (cols - self.min_col)
+        # positions of the points sorted by cell, points of a cell stay in their original order
+        self.order = np.argsort(keys, kind='stable')
+        self.keys = keys[self.order]
+
+    def cells(self, lat, lon):
+        return (np.floor(np.asarray(lat, dtype=np.float64) / self.cell_size).astype(np.int64),
+                np.floor(np.asarray(lon, dtype=np.float64) / self.cell_size).astype(np.int64))
+
+    @property
+    def nbytes(self) -> int:
+        return self.order.nbytes + self.keys.nbytes
+
+    # Positions (sorted) of the points in the bounding box, bounds included
+    def query_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> np.ndarray:
+        (first_row, last_row), (first_col, last_col) = self.cells([min_lat, max_lat], [min_lon, max_lon])
+        # only the cells of the grid holding points
+        first_row, last_row = max(first_row, self.min_row), min(last_row, self.max_row)
+        first_col, last_col = max(first_col, self.min_col), min(last_col, self.max_col)
+        if first_row > last_row or first_col > last_col:
+            return np.empty(0, dtype=np.int64)
+        row_keys = (np.arange(first_row, last_row + 1) - self.min_row) * self.num_cols
+        starts = np.searchsorted(self.keys, row_keys + (first_col - self.min_col), side='left')
+        ends = np.searchsorted(self.keys, row_keys + (last_col - self.min_col), side='right')
+        candidates = np.concatenate([self.order[start:end] for start, end in zip(starts, ends)])
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon)
+        return np.sort(candidates[inside])
+
+    # Positions (sorted) of the points at most radius km away from (lat, lon)
+    def query_radius(self, lat: float, lon: float, radius: float) -> np.ndarray:
+        candidates = np.sort(np.concatenate([self.query_bbox(*bbox) for bbox in circle_bboxes(lat, lon, radius)]))
+        distance = haversine(lat, lon, self.lat[candidates], self.lon[candidates])
+        return candidates[distance <= radius]
+
+
+# Bounding boxes (min_lat, min_lon, max_lat, max_lon) of the points at most radius km away from (lat, lon),
+# the longitude span grows with the latitude. The longitudes of the boxes stay in [-180, 180]: a box crossing
+# the antimeridian is split in one box on each side of it.
+def circle_bboxes(lat: float, lon: float, radius: float) -> List[Tuple[float, float, float, float]]:
+    dlat = np.degrees(radius / EARTH_RADIUS)
+    cos_lat = np.cos(np.radians(min(abs(lat) + dlat, 90.0)))
+    dlon = 180.0 if cos_lat < 1e-12 else min(np.degrees(radius / (EARTH_RADIUS * cos_lat)), 180.0)
+    min_lat, min_lon, max_lat, max_lon = lat - dlat, lon - dlon, lat + dlat, lon + dlon
+    if dlon >= 180.0:
+        return [(min_lat, -180.0, max_lat, 180.0)]
+    if min_lon < -180.0:
+        return [(min_lat, min_lon + 360.0, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+    if max_lon > 180.0:
+        return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon - 360.0)]
+    return [(min_lat, min_lon, max_lat, max_lon)]
+
+
+# Positions of the items owning the given positions, items own the ranges [offsets[i], offsets[i+1])
+def owners(offsets: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    return np.searchsorted(offsets, positions, side='right') - 1
@@ -0,0 +1,50 @@
+import importlib
+import os
+import shutil
+
+import pytest
+from fastapi.testclient import TestClient
+
+# internal imports
+from snapshot_cache import SOURCE_FILES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIR_NAMES = ['database_csv_1', 'database_csv_3']
+
+
+# Copy the csv files of a bundled directory to path, so the snapshots are written in a temporary directory
+def copy_directory(name: str, path) -> str:
+    os.makedirs(path)
+    for file_name in SOURCE_FILES:
+        shutil.copy(os.path.join(ROOT, name, file_name), path)
+    return str(path)
+
+
+# Copies of the bundled directories
+@pytest.fixture
+def dir_paths(tmp_path):
+    return [copy_directory(name, tmp_path / name) for name in DIR_NAMES]
+
+
+# The API module. It loads its directories when it is imported, none of them match the pattern set here:
+# the tests replace its dataset with the directories they use (see make_client).
+@pytest.fixture(scope='session')
+def api(tmp_path_factory):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('DATA_DIR_PATTERN', str(tmp_path_factory.mktemp('no_data') / 'database_csv_*'))
+        monkeypatch.delenv('REFRESH_INTERVAL', raising=False)
+        return importlib.import_module('API_endpoints')
+
+
+# Client of the API serving the given directories, loaded in the given mode (see API_endpoints.data_loading),
+# with an empty response cache
+@pytest.fixture
+def make_client(api, monkeypatch):
+    def make(dir_paths, data_loading='eager', dir_pattern=None, lazy_cache_bytes=api.lazy_cache_bytes):
+        monkeypatch.setattr(api, 'data_loading', data_loading)
+        monkeypatch.setattr(api, 'lazy_cache_bytes', lazy_cache_bytes)
+        monkeypatch.setattr(api, 'dataset', api.Dataset(api.load_parts, api.combine_parts, dir_paths, dir_pattern))
+        monkeypatch.setattr(api, 'response_cache', api.ResponseCache(api.response_cache.max_bytes,
+                                                                     lambda: api.dataset.current.version, api.compression))
+        return TestClient(api.data_router, headers={'Authorization': 'Bearer bob'})
+    return make
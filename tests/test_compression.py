@@ -0,0 +1,73 @@
+import zlib
+
+import pytest
+
+# internal imports
+from compression import Compression, StreamCompressor, accepted_encodings, available_encodings, brotli, zstandard
+
+ENCODINGS = available_encodings()
+
+
+# Incremental decoder of an encoding, returning the data decoded so far from each compressed chunk
+def stream_decoder(encoding: str):
+    if encoding == 'br':
+        return brotli.Decompressor().process
+    if encoding == 'zstd':
+        return zstandard.ZstdDecompressor().decompressobj().decompress
+    return zlib.decompressobj(16 + zlib.MAX_WBITS).decompress
+
+
+@pytest.mark.parametrize('encoding', ENCODINGS)
+def test_compressed_response_decodes_to_the_same_body(dir_paths, make_client, api, encoding):
+    client = make_client(dir_paths)
+    if encoding not in api.compression.encodings:
+        pytest.skip(f'{encoding} is not in RESPONSE_COMPRESSION')
+    identity = client.get('/dashboard/gps', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in identity.headers
+    response = client.get('/dashboard/gps', headers={'Accept-Encoding': encoding})
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in response.headers['Vary']
+    # the client decodes the body
+    assert response.content == identity.content
+
+
+@pytest.mark.parametrize('encoding', ENCODINGS)
+def test_streamed_response_is_compressed_chunk_by_chunk(dir_paths, make_client, api, monkeypatch, encoding):
+    client = make_client(dir_paths)
+    if encoding not in api.compression.encodings:
+        pytest.skip(f'{encoding} is not in RESPONSE_COMPRESSION')
+    monkeypatch.setattr(api, 'STREAM_CHUNK_SIZE', 10)
+    headers = {'Accept': 'application/x-ndjson'}
+    identity = client.get('/dashboard/gps', headers={**headers, 'Accept-Encoding': 'identity'})
+    response = client.get('/dashboard/gps', headers={**headers, 'Accept-Encoding': encoding})
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Content-Length' not in response.headers
+    assert response.content == identity.content
+    assert len(identity.content.splitlines()) > 10
+
+
+@pytest.mark.parametrize('encoding', ENCODINGS)
+def test_stream_compressor_flushes_every_chunk(encoding):
+    chunks = [b'{"Latitude": 48.1, "Longitude": 11.5}\n' * (i + 1) for i in range(5)]
+    compressor = StreamCompressor(encoding)
+    decode = stream_decoder(encoding)
+    # every chunk can be decoded as soon as it is received
+    for chunk in chunks:
+        assert decode(compressor.compress(chunk)) == chunk
+    assert decode(compressor.finish()) == b''
+
+
+def test_negotiation_follows_the_server_order_and_the_qualities():
+    compression = Compression(ENCODINGS, 10)
+    assert compression.negotiate('gzip, br, zstd') == ENCODINGS[0]
+    assert compression.negotiate('gzip;q=0.5, br;q=0, zstd;q=0') == 'gzip'
+    assert compression.negotiate('*') == ENCODINGS[0]
+    assert compression.negotiate('identity') is None
+    assert compression.negotiate(None) is None
+    assert accepted_encodings('gzip, br;q=0.5, zstd;q=x') == {'gzip': 1.0, 'br': 0.5, 'zstd': 0.0}
+
+
+def test_small_bodies_are_not_compressed():
+    compression = Compression(['gzip'], 10)
+    assert not compression.compressible(b'123456789')
+    assert compression.compressible(b'1234567890')
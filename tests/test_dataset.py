@@ -0,0 +1,51 @@
+import shutil
+
+import pytest
+
+# internal imports
+from conftest import copy_directory
+
+
+@pytest.mark.parametrize('data_loading', ['eager', 'lazy'])
+def test_refresh_loads_the_changed_directories(tmp_path, make_client, api, data_loading):
+    first = copy_directory('database_csv_1', tmp_path / 'database_csv_1')
+    client = make_client([first], data_loading, dir_pattern=str(tmp_path / 'database_csv_*'))
+    dataset = api.dataset
+    previous = dataset.current
+    cursor = client.get('/dashboard/gps', params={'limit': 10}).headers['X-Next-Cursor']
+    assert not dataset.refresh()
+    assert dataset.current is previous
+
+    # new directory matching the pattern, the first directory is not loaded again
+    second = copy_directory('database_csv_3', tmp_path / 'database_csv_3')
+    assert dataset.refresh()
+    assert dataset.last_error is None
+    assert dataset.current.version != previous.version
+    assert dataset.current.dir_paths == [first, second]
+    assert dataset.current.parts[first] is previous.parts[first]
+    assert len(dataset.current.store) == 4
+    # a cursor of the previous version cannot be continued
+    response = client.get('/dashboard/gps', params={'limit': 10, 'cursor': cursor})
+    assert response.status_code == 409
+
+    # rows appended to the csv files of the second directory
+    previous = dataset.current
+    with open(f'{second}/rides.csv', 'a') as f:
+        f.write('1,5,appended\n')
+    with open(f'{second}/scenes.csv', 'a') as f:
+        f.write('9,5,appended_scene\n')
+    assert dataset.refresh()
+    assert dataset.last_error is None
+    assert dataset.current.version != previous.version
+    assert dataset.current.parts[first] is previous.parts[first]
+    assert [ride['name'] for ride in client.get('/dashboard/rides').json()][-1] == 'appended'
+
+    # removed directory
+    previous = dataset.current
+    shutil.rmtree(second)
+    assert dataset.refresh()
+    assert dataset.last_error is None
+    assert dataset.current.version != previous.version
+    assert dataset.current.dir_paths == [first]
+    assert dataset.current.parts[first] is previous.parts[first]
+    assert len(client.get('/dashboard/rides').json()) == 3
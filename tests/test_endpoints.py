@@ -0,0 +1,59 @@
+# internal imports
+from helper_functions import load_directory
+
+
+# Responses of the endpoints for every ride and scene of the served directories
+def endpoint_responses(client) -> dict:
+    responses = {}
+
+    def get(url, **params):
+        response = client.get(url, params=params)
+        assert response.status_code == 200, url
+        responses[(url, tuple(sorted(params.items())))] = response.json()
+        return response.json()
+
+    rides = get('/dashboard/rides')
+    get('/dashboard/rides', limit=2)
+    get('/dashboard/summary')
+    points = get('/dashboard/gps')
+    get('/dashboard/gps', limit=10, encoding='delta')
+    get('/dashboard/gps/heatmap', resolution=0.01)
+    lat, lon = points[0]['Latitude'], points[0]['Longitude']
+    get('/dashboard/gps/bbox', min_lat=lat - 0.01, min_lon=lon - 0.01, max_lat=lat + 0.01, max_lon=lon + 0.01)
+    get('/dashboard/gps/radius', lat=lat, lon=lon, radius=0.5)
+    for ride in rides:
+        name = ride['name']
+        get(f'/dashboard/{name}')
+        get(f'/dashboard/{name}', zoom=15, encoding='polyline')
+        for scene in get(f'/dashboard/{name}/scenes'):
+            get(f'/dashboard/{name}/scenes/{scene["scene"]}', tolerance=1)
+    names = [ride['name'] for ride in rides]
+    responses['details'] = client.post('/dashboard/rides/details', json=names).json()
+    return responses
+
+
+def test_lazy_and_eager_responses_are_identical(dir_paths, make_client):
+    eager = endpoint_responses(make_client(dir_paths))
+    # nothing kept in memory, every ride is read again from its snapshot
+    lazy = endpoint_responses(make_client(dir_paths, 'lazy', lazy_cache_bytes=0))
+    assert eager.keys() == lazy.keys()
+    for key in eager:
+        assert lazy[key] == eager[key], key
+
+
+def test_lazy_ride_of_a_changed_directory(dir_paths, make_client, api):
+    client = make_client(dir_paths, 'lazy', lazy_cache_bytes=0)
+    name = client.get('/dashboard/rides').json()[0]['name']
+    # a ride inserted before the other rides of the directory, whose snapshot is written again
+    path = dir_paths[0]
+    with open(f'{path}/rides.csv') as f:
+        header, *rows = f.readlines()
+    with open(f'{path}/rides.csv', 'w') as f:
+        f.writelines([header, '100,inserted\n', *rows])
+    with open(f'{path}/scenes.csv', 'a') as f:
+        f.write('100,100,inserted_scene\n')
+    load_directory(path)
+    # the rows of the ride are not read at the position of the previous version
+    assert client.get(f'/dashboard/{name}').status_code == 503
+    assert api.dataset.refresh()
+    assert client.get(f'/dashboard/{name}').status_code == 200
@@ -0,0 +1,65 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+# internal imports
+from helper_functions import get_data
+
+# json.dump of get_data on the bundled directories, written by the implementation that filtered the frames
+# for every ride, scene and sample
+GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'get_data_database_csv_1_3.json')
+# ride summary fields computed differently since the golden file was written (see summarize_rides)
+SUMMARY_FIELDS = ['duration', 'date', 'time', 'distance']
+# sensor fields kept as float32 since the golden file was written
+FLOAT32_FIELDS = ['lat_std', 'lon_std', 'hgt_std']
+
+
+# Rides without the summary fields, with the float32 fields rounded as they are stored
+def comparable(rides):
+    for ride in rides:
+        for field in SUMMARY_FIELDS:
+            ride.pop(field)
+        for scene in ride['scenes']:
+            for sample in scene['samples']:
+                for sensor in sample['sensors']:
+                    for field in FLOAT32_FIELDS:
+                        if sensor[field] is not None:
+                            sensor[field] = float(np.float32(sensor[field]))
+    return rides
+
+
+@pytest.fixture(scope='module')
+def golden():
+    with open(GOLDEN) as f:
+        return comparable(json.load(f))
+
+
+def assert_same_output(data, golden):
+    data = comparable(data)
+    # compare the rides first for a readable difference, then the dumps (key order, float formatting)
+    assert [ride['name'] for ride in data] == [ride['name'] for ride in golden]
+    for ride, expected_ride in zip(data, golden):
+        assert ride == expected_ride, ride['name']
+    assert json.dumps(data) == json.dumps(golden)
+
+
+def test_get_data_matches_golden(dir_paths, golden):
+    assert_same_output(get_data(dir_paths, cache=False), golden)
+
+
+def test_get_data_from_snapshot_matches_golden(dir_paths, golden):
+    # the first call parses the csv files and writes the snapshots, the second one reads the snapshots
+    assert_same_output(get_data(dir_paths), golden)
+    assert all(os.path.exists(os.path.join(path, '.snapshot.npz')) for path in dir_paths)
+    assert_same_output(get_data(dir_paths), golden)
+
+
+def test_get_data_with_workers_matches_golden(dir_paths, golden):
+    assert_same_output(get_data(dir_paths, cache=False, workers=2), golden)
+
+
+def test_get_data_in_small_chunks_matches_golden(dir_paths, golden):
+    # a budget small enough to parse the large csv files in several chunks
+    assert_same_output(get_data(dir_paths, cache=False, memory_budget=1), golden)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+# internal imports
+from generated_client.fast_api_client.gps_encoding import decode_gps, decode_polyline
+from gps_encoding import ENCODINGS, encode_gps, polyline_encode
+
+
+# Coordinates rounded as the encodings round them
+def rounded(lat: np.ndarray, lon: np.ndarray, precision: int) -> list:
+    scale = 10 ** precision
+    return np.column_stack((np.round(lat * scale).astype(np.int64) / scale,
+                            np.round(lon * scale).astype(np.int64) / scale)).tolist()
+
+
+def test_polyline_reference_vector():
+    # example of the documentation of the Google encoded polyline algorithm
+    lat, lon = np.array([38.5, 40.7, 43.252]), np.array([-120.2, -120.95, -126.453])
+    assert polyline_encode(lat, lon, 5) == '_p~iF~ps|U_ulLnnqC_mqNvxq`@'
+    assert decode_polyline('_p~iF~ps|U_ulLnnqC_mqNvxq`@', 5) == [[38.5, -120.2], [40.7, -120.95], [43.252, -126.453]]
+
+
+@pytest.mark.parametrize('encoding', ENCODINGS)
+@pytest.mark.parametrize('precision', [0, 5, 6, 7])
+def test_decoded_track_is_the_rounded_track(encoding, precision):
+    rng = np.random.default_rng(precision)
+    # a track with small steps, then points anywhere on the earth
+    lat = np.concatenate([48.1 + np.cumsum(rng.normal(0, 1e-4, 500)), rng.uniform(-90, 90, 100)])
+    lon = np.concatenate([11.5 + np.cumsum(rng.normal(0, 1e-4, 500)), rng.uniform(-180, 180, 100)])
+    assert decode_gps(encode_gps(lat, lon, encoding, precision)) == rounded(lat, lon, precision)
+
+
+@pytest.mark.parametrize('encoding', ENCODINGS)
+def test_empty_track(encoding):
+    assert decode_gps(encode_gps(np.empty(0), np.empty(0), encoding)) == []
+
+
+@pytest.mark.parametrize('encoding', ENCODINGS)
+def test_decoded_ride_track_matches_the_coordinates(dir_paths, make_client, encoding):
+    client = make_client(dir_paths)
+    for ride in client.get('/dashboard/rides').json():
+        coordinates = np.array(client.get(f'/dashboard/{ride["name"]}').json()['gps_coordinates']).reshape(-1, 2)
+        encoded = client.get(f'/dashboard/{ride["name"]}', params={'encoding': encoding, 'precision': 6}).json()
+        assert decode_gps(encoded['gps_coordinates']) == rounded(coordinates[:, 0], coordinates[:, 1], 6)
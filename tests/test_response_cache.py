@@ -0,0 +1,65 @@
+# internal imports
+from compression import Compression
+from response_cache import CachedResponse, ResponseCache, etag_matches
+
+
+def test_repeated_request_with_the_etag_gets_304(dir_paths, make_client):
+    client = make_client(dir_paths)
+    response = client.get('/dashboard/rides', headers={'Accept-Encoding': 'identity'})
+    etag = response.headers['ETag']
+    revalidated = client.get('/dashboard/rides', headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b''
+    assert revalidated.headers['ETag'] == etag
+    # another representation of the resource has another ETag
+    assert client.get('/dashboard/rides', headers={'Accept': 'application/x-ndjson', 'If-None-Match': etag}).status_code == 200
+
+
+def test_etag_of_an_encoding_matches_the_other_encodings(dir_paths, make_client):
+    client = make_client(dir_paths)
+    response = client.get('/dashboard/gps', headers={'Accept-Encoding': 'gzip'})
+    etag = response.headers['ETag']
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert etag.endswith('-gzip"')
+    # the client has the same body, only the transfer differs
+    assert client.get('/dashboard/gps', headers={'Accept-Encoding': 'identity', 'If-None-Match': etag}).status_code == 304
+    assert client.get('/dashboard/gps', headers={'Accept-Encoding': 'gzip', 'If-None-Match': f'W/{etag}'}).status_code == 304
+
+
+def test_etag_matches():
+    etag = '"0123abcd"'
+    assert etag_matches(etag, etag)
+    assert etag_matches('"0123abcd-br"', etag)
+    assert etag_matches('"other", W/"0123abcd-gzip"', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_eviction_keeps_the_cache_within_max_bytes():
+    cache = ResponseCache(3000, lambda: 'version', Compression(['gzip'], 0))
+    for i in range(20):
+        key = ('/path', i)
+        entry = CachedResponse(bytes(range(256)) * (i % 5 + 1), 'application/json', {})
+        cache.put('version', key, entry)
+        assert cache.nbytes <= cache.max_bytes
+        cache.encoded_body(key, entry, 'gzip')
+        assert cache.nbytes <= cache.max_bytes
+        assert cache.nbytes == sum(cached.nbytes for cached in cache.entries.values())
+    # the most recently used entry is kept
+    assert ('/path', 19) in cache.entries
+    # an entry larger than the cache is not kept
+    cache.put('version', 'large', CachedResponse(b'x' * 4000, 'application/json', {}))
+    assert 'large' not in cache.entries
+
+
+def test_responses_of_a_previous_version_are_not_kept():
+    versions = ['first']
+    cache = ResponseCache(2**20, lambda: versions[-1])
+    cache.put('first', 'key', CachedResponse(b'body', 'application/json', {}))
+    versions.append('second')
+    cache.put('first', 'other', CachedResponse(b'body', 'application/json', {}))
+    assert cache.get('first', 'other') is None
+    assert cache.get('second', 'key') is None
+    cache.put('second', 'key', CachedResponse(b'new', 'application/json', {}))
+    assert list(cache.entries) == ['key']
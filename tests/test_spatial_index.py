@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+# internal imports
+from helper_functions import haversine
+from ride_store import CombinedRideStore, LazyRideStore, load_directory_stores, load_directory_summaries
+from spatial_index import GridIndex
+
+
+# Points spread over a few cells around (lat, lon), plus points on both sides of the antimeridian and near a pole
+@pytest.fixture(scope='module')
+def points():
+    rng = np.random.default_rng(0)
+    lat = np.concatenate([rng.uniform(48.0, 48.1, 2000), rng.uniform(-1, 1, 500), rng.uniform(89.9, 90, 100)])
+    lon = np.concatenate([rng.uniform(11.5, 11.6, 2000), rng.uniform(179, 180, 250), rng.uniform(-180, -179, 250),
+                          rng.uniform(-180, 180, 100)])
+    return lat, lon
+
+
+def test_query_bbox_matches_brute_force(points):
+    lat, lon = points
+    index = GridIndex(lat, lon)
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        center = rng.integers(len(lat))
+        min_lat, max_lat = np.sort(lat[center] + rng.uniform(-0.05, 0.05, 2))
+        min_lon, max_lon = np.sort(lon[center] + rng.uniform(-0.05, 0.05, 2))
+        expected = np.flatnonzero((lat >= min_lat) & (lat <= max_lat) & (lon >= min_lon) & (lon <= max_lon))
+        np.testing.assert_array_equal(index.query_bbox(min_lat, min_lon, max_lat, max_lon), expected)
+
+
+def test_query_radius_matches_brute_force(points):
+    lat, lon = points
+    index = GridIndex(lat, lon)
+    rng = np.random.default_rng(2)
+    for _ in range(200):
+        center = rng.integers(len(lat))
+        radius = rng.uniform(0.01, 50)
+        expected = np.flatnonzero(haversine(lat[center], lon[center], lat, lon) <= radius)
+        np.testing.assert_array_equal(index.query_radius(lat[center], lon[center], radius), expected)
+
+
+def test_query_radius_across_the_antimeridian():
+    index = GridIndex(np.array([0.0, 0.0, 0.0]), np.array([-179.999, 179.5, 0.0]))
+    np.testing.assert_array_equal(index.query_radius(0.0, 179.999, 20), [0])
+    np.testing.assert_array_equal(index.query_radius(0.0, -179.999, 20), [0])
+
+
+def test_lazy_gps_in_area_matches_eager(dir_paths):
+    eager = CombinedRideStore(load_directory_stores(dir_paths))
+    lazy = LazyRideStore(dir_paths, load_directory_summaries(dir_paths), max_bytes=0)
+    lat, lon, _ = eager.gps_points()
+    rng = np.random.default_rng(3)
+    areas = [{'circle': (lat[0], lon[0], 1e4)}, {'bbox': (-90, -180, 90, 180)}, {'bbox': (0, 0, 1, 1)}]
+    for center in rng.integers(len(lat), size=20):
+        areas.append({'circle': (lat[center], lon[center], rng.uniform(0.001, 2))})
+        areas.append({'bbox': (lat[center] - 0.001, lon[center] - 0.002, lat[center] + 0.002, lon[center] + 0.001)})
+    for area in areas:
+        for expected, result in zip(eager.gps_in_area(**area), lazy.gps_in_area(**area)):
+            np.testing.assert_array_equal(result, expected)
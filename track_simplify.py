@@ -0,0 +1,50 @@
+import heapq
+import numpy as np
+
+# mean earth radius in m
+EARTH_RADIUS = 6371000
+# size of a pixel in m at the equator for zoom level 0 of the web mercator tiles used by the maps
+ZOOM_0_PIXEL_SIZE = 156543.03392
+
+
+# Visvalingam-Whyatt ranks of the points of a track.
+# The point forming the smallest triangle with its neighbours is removed first, then the triangles of its
+# neighbours are updated, and so on. The rank of a point is the square root (in m) of the area of its triangle
+# when it was removed, raised to the ranks of the points removed before it so the ranks only grow:
+# keeping the points with rank >= tolerance gives the simplified track for this tolerance.
+# The first and last points are always kept (infinite rank).
+def visvalingam_ranks(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    n = len(lat)
+    if n < 3:
+        return np.full(n, np.inf)
+    # equirectangular projection around the track, in m
+    y = np.radians(lat) * EARTH_RADIUS
+    x = np.radians(lon) * EARTH_RADIUS * np.cos(np.radians(np.mean(lat)))
+    areas = np.full(n, np.inf)
+    areas[1:-1] = np.abs((x[:-2] - x[1:-1]) * (y[2:] - y[1:-1]) - (x[2:] - x[1:-1]) * (y[:-2] - y[1:-1])) / 2
+    x, y, areas = x.tolist(), y.tolist(), areas.tolist()
+    prev, nxt = list(range(-1, n - 1)), list(range(1, n + 1))
+    heap = [(areas[i], i) for i in range(1, n - 1)]
+    heapq.heapify(heap)
+    ranks = [np.inf] * n
+    removed_area = 0.0
+    while heap:
+        area, i = heapq.heappop(heap)
+        # skip the outdated entries of points whose triangle changed
+        if area != areas[i] or ranks[i] != np.inf:
+            continue
+        removed_area = max(removed_area, area)
+        ranks[i] = removed_area
+        p, q = prev[i], nxt[i]
+        nxt[p], prev[q] = q, p
+        for j in (p, q):
+            if 0 < j < n - 1:
+                a, b = prev[j], nxt[j]
+                areas[j] = abs((x[a] - x[j]) * (y[b] - y[j]) - (x[b] - x[j]) * (y[a] - y[j])) / 2
+                heapq.heappush(heap, (areas[j], j))
+    return np.sqrt(ranks)
+
+
+# Tolerance in m matching one pixel of a map at the given zoom level and latitude
+def zoom_tolerance(zoom: float, lat: float) -> float:
+    return ZOOM_0_PIXEL_SIZE * np.cos(np.radians(lat)) / 2 ** zoom